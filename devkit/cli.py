@@ -1,10 +1,21 @@
 #!/usr/bin/env python3
 
+import functools
+import hashlib
+import importlib.util
 import json
+import logging
+import os
+import re
+import shlex
+import shutil
 import subprocess
 import sys
+import threading
+from collections import deque
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Deque, List, Optional, Tuple
 
 import click
 
@@ -16,73 +27,416 @@ from devkit.versioning import (
     create_git_tag,
     get_current_version,
     get_latest_git_tag,
+    parse_semantic_version,
     push_git_tag,
     update_version_in_files,
 )
 
-try:
-    from devkit.docker import (
-        DockerError,
-        build_docker_image,
-        check_docker_installed,
-        check_kyverno_policy,
-        check_tool_installed,
-        generate_docker_tags,
-        generate_sbom,
-        push_docker_image,
-        scan_docker_image,
-        secure_pipeline,
-        sign_image,
-        tag_docker_image,
-        test_docker_image,
-        verify_image_signature,
-    )
-    DOCKER_AVAILABLE = True
-except ImportError:
-    DOCKER_AVAILABLE = False
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Lines of stderr kept from captured commands for error messages
+STDERR_TAIL_LINES = 200
+
+# Read size for captured subprocess pipes
+PIPE_BUFFER_SIZE = 1024 * 1024
+
+BRANCH_TYPES = ["feature", "bugfix", "release", "hotfix"]
+
+# key=value pairs separated by commas; values may themselves contain "="
+_BUILD_ARG_RE = re.compile(r"([^,=]+)=([^,]*)")
+
+
+def _validate_semver(ctx, param, value: str) -> str:
+    """Click callback rejecting versions that are not MAJOR.MINOR.PATCH."""
+    try:
+        parse_semantic_version(value)
+    except ValueError:
+        raise click.BadParameter(
+            "Invalid version format. Use semantic versioning (e.g., 1.2.3)")
+    return value
+
+
+# Docker support is imported lazily by the docker commands; see _docker_available()
+DOCKER_AVAILABLE: Optional[bool] = None
+
+
+def _docker_available() -> bool:
+    """Import devkit.docker on first use and remember whether it succeeded."""
+    global DOCKER_AVAILABLE
+    if DOCKER_AVAILABLE is None:
+        try:
+            import devkit.docker  # noqa: F401
+            DOCKER_AVAILABLE = True
+        except ImportError:
+            DOCKER_AVAILABLE = False
+    return DOCKER_AVAILABLE
+
+
+def echo_lines(*lines: str, err: bool = False) -> None:
+    """Echo several lines with a single write instead of one per line."""
+    click.echo("\n".join(lines), err=err)
+
+
+@functools.lru_cache(maxsize=None)
+def _which(program: str) -> Optional[str]:
+    """Look a program up on PATH once, returning None if it isn't there."""
+    return shutil.which(program)
+
+
+def _find_executable(program: str) -> Optional[str]:
+    """Return the executable to run for a program, or None if it is missing.
+
+    Bare names are resolved through the cached PATH lookup; explicit paths
+    such as .venv/bin/pip are passed through, since they may not exist yet.
+    """
+    if os.path.dirname(program):
+        return program
+    return _which(program)
+
+
+def _resolve_command(command: List[str]) -> List[str]:
+    """Return the command with its executable resolved to an absolute path."""
+    return [_find_executable(command[0]) or command[0], *command[1:]]
+
+
+def _decode(output: bytes) -> str:
+    """Decode captured subprocess output, replacing invalid bytes."""
+    return output.decode("utf-8", errors="replace")
 
 
 def run_command(
     command: List[str], capture_output: bool = True, check: bool = True
 ) -> Tuple[bool, Optional[str]]:
     """Run a shell command and return success status and output."""
-    try:
-        if capture_output:
-            result = subprocess.run(
-                command, check=check, capture_output=True, text=True
-            )
-            return True, result.stdout
-        else:
-            subprocess.run(command, check=check)
+    # Fail fast with a clear message instead of a FileNotFoundError
+    executable = _find_executable(command[0])
+    if executable is None:
+        click.echo(f"❌ {command[0]} not found in PATH", err=True)
+        return False, None
+
+    # Python-created fds are non-inheritable, so keeping close_fds=False is
+    # safe and lets subprocess use the faster posix_spawn() path.
+    command = [executable, *command[1:]]
+    if not capture_output:
+        try:
+            subprocess.run(command, check=check, close_fds=False)
             return True, None
-    except subprocess.CalledProcessError as e:
-        if capture_output:
-            click.echo(f"Error: {e.stderr}", err=True)
+        except subprocess.CalledProcessError:
+            return False, None
+
+    # Only the tail of stderr is kept for error reporting, so chatty tools
+    # don't accumulate their whole log in memory
+    # Pipes are read in binary with a large buffer and decoded once at the end.
+    stderr_tail: Deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+    with subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        bufsize=PIPE_BUFFER_SIZE, close_fds=False
+    ) as proc:
+        reader = threading.Thread(
+            target=stderr_tail.extend, args=(proc.stderr,), daemon=True)
+        reader.start()
+        stdout = proc.stdout.read()
+        reader.join()
+
+    if check and proc.returncode != 0:
+        click.echo(f"Error: {_decode(b''.join(stderr_tail))}", err=True)
         return False, None
+    return True, _decode(stdout)
+
+
+def exec_command(command: List[str]) -> None:
+    """Replace the CLI process with a final command; does not return.
+
+    Only use this for the last step of a command, since nothing after it runs.
+    The command's exit status becomes the CLI's exit status.
+    """
+    executable = _find_executable(command[0])
+    if executable is None:
+        click.echo(f"❌ {command[0]} not found in PATH", err=True)
+        sys.exit(1)
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    command = [executable, *command[1:]]
+    if os.name == "posix":
+        os.execv(command[0], command)
+    # exec on Windows spawns a child and exits, so wait for it explicitly
+    sys.exit(subprocess.run(command).returncode)
+
+
+def run_command_groups(groups: List[List[List[str]]]) -> Optional[List[str]]:
+    """Run command groups concurrently; commands within a group run in order.
+
+    All child processes are driven from a single asyncio event loop. As soon
+    as one command fails, no further commands are started and the ones still
+    running are terminated.
+
+    Returns the first command that failed, or None if every command succeeded.
+    """
+    # asyncio is imported here since it dominates the CLI's import time
+    import asyncio
+
+    return asyncio.run(_run_command_groups(groups))
+
+
+async def _run_command_groups(
+    groups: List[List[List[str]]]
+) -> Optional[List[str]]:
+    import asyncio
+
+    failed: List[List[str]] = []
+    running: List[asyncio.subprocess.Process] = []
+
+    def fail(cmd: List[str], message: str) -> None:
+        failed.append(cmd)
+        for other in running:
+            try:
+                other.terminate()
+            except ProcessLookupError:
+                pass
+        click.echo(f"Error: {message}", err=True)
+
+    async def run_group(group: List[List[str]]) -> None:
+        for cmd in group:
+            if failed:
+                return
+            # Spawn errors are reported as failures rather than raised, so
+            # sibling groups never need to be cancelled mid-spawn
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *_resolve_command(cmd), stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE, close_fds=False
+                )
+            except OSError as e:
+                if not failed:
+                    fail(cmd, str(e))
+                return
+
+            running.append(proc)
+            if failed:
+                # Another command failed while this one was being spawned
+                proc.terminate()
+            label = _command_label(cmd)
+            try:
+                await asyncio.gather(
+                    _relay_output(proc.stdout, label, err=False),
+                    _relay_output(proc.stderr, label, err=True),
+                )
+                await proc.wait()
+            except asyncio.CancelledError:
+                proc.kill()
+                raise
+            finally:
+                running.remove(proc)
+
+            if proc.returncode == 0:
+                continue
+            # Otherwise it may have been terminated because another failed
+            if not failed:
+                fail(cmd, f"{describe_command(cmd)} exited with code {proc.returncode}")
+            return
+
+    await asyncio.gather(*(run_group(group) for group in groups))
+    return failed[0] if failed else None
+
+
+async def _relay_output(stream, label: str, err: bool) -> None:
+    """Echo a child's output line by line, prefixed with its label, as it arrives.
+
+    Every pipe is drained as soon as data is ready, so a chatty command can
+    never block on a full pipe while another command's output is being read.
+    """
+    pending = b""
+    while True:
+        chunk = await stream.read(PIPE_BUFFER_SIZE)
+        if not chunk:
+            break
+        *lines, pending = (pending + chunk).split(b"\n")
+        if lines:
+            echo_lines(*(f"[{label}] {_decode(line)}" for line in lines), err=err)
+    if pending:
+        click.echo(f"[{label}] {_decode(pending)}", err=err)
+
+
+def _command_label(command: List[str]) -> str:
+    """Return a short prefix identifying a command in interleaved output."""
+    words = describe_command([Path(command[0]).name, *command[1:]]).split()
+    label = []
+    for word in words[:3]:
+        if word.startswith("-") or word == "&&":
+            break
+        label.append(word)
+    return " ".join(label)
+
+
+def _git_output(command: List[str], input: Optional[str] = None) -> Optional[str]:
+    """Run a git command quietly and return its stripped stdout, or None on failure."""
+    try:
+        result = subprocess.run(
+            _resolve_command(["git", *command]), stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, close_fds=False,
+            input=None if input is None else input.encode())
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return _decode(result.stdout).strip()
+
+
+def _push_cache_path() -> Optional[Path]:
+    """Return the push check cache file; it lives in the git dir, outside the tree."""
+    path = _git_output(["rev-parse", "--git-path", "devkit-push-cache.json"])
+    return Path(path) if path else None
+
+
+def _worktree_key() -> Optional[str]:
+    """Return a hash of the working tree, including uncommitted changes.
+
+    Starts from the blob ids in the index and rehashes only modified and
+    untracked (non-ignored) files, which git does without writing any
+    objects. git's stat cache means unchanged tracked files are not read.
+    Config such as pyproject.toml is part of the tree, so tool configuration
+    changes produce a new key.
+    """
+    top = _git_output(["rev-parse", "--show-toplevel"])
+    if top is None:
+        return None
+    index = _git_output(["-C", top, "ls-files", "-z", "--stage"])
+    changed = _git_output(
+        ["-C", top, "ls-files", "-z", "--modified", "--others", "--exclude-standard"])
+    if index is None or changed is None:
+        return None
+
+    blobs = {}
+    for entry in filter(None, index.split("\0")):
+        info, path = entry.split("\t", 1)
+        blobs[path] = info.split()[1]
+
+    # Deleted files are listed as modified but have no content to hash
+    paths = sorted({path for path in changed.split("\0") if path})
+    for path in paths:
+        blobs.pop(path, None)
+    present = [path for path in paths if os.path.exists(os.path.join(top, path))]
+    if any("\n" in path for path in present):
+        return None  # --stdin-paths reads one path per line
+    if present:
+        hashes = _git_output(
+            ["-C", top, "hash-object", "--stdin-paths"], input="\n".join(present))
+        if hashes is None:
+            return None
+        blobs.update(zip(present, hashes.split()))
+
+    digest = hashlib.sha1()
+    for path in sorted(blobs):
+        digest.update(f"{path}\0{blobs[path]}\0".encode())
+    return digest.hexdigest()
+
+
+def load_passed_checks(key: Optional[str]) -> List[str]:
+    """Return the push checks that already passed for a working tree key."""
+    path = _push_cache_path()
+    if key is None or path is None:
+        return []
+    try:
+        cache = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return []
+    if cache.get("tree") != key:
+        return []
+    return cache.get("stages_passed", [])
+
+
+def save_passed_checks(key: Optional[str], stages: List[str]) -> None:
+    """Record the push checks that passed for a working tree key."""
+    path = _push_cache_path()
+    if key is None or path is None:
+        return
+    try:
+        path.write_text(json.dumps({"tree": key, "stages_passed": stages}))
+    except OSError:
+        pass
+
+
+# Runs black then isort in one interpreter so the two don't each pay startup cost
+_PYTHON_FORMAT_SCRIPT = (
+    "import sys\n"
+    "from black import main as black_main\n"
+    "from isort.main import main as isort_main\n"
+    "if black_main(['.'], standalone_mode=False):\n"
+    "    sys.exit(1)\n"
+    "isort_main(['.'])\n"
+)
+
+
+RUFF_FIX_CMD = ["ruff", "check", ".", "--fix"]
+
+
+def python_format_commands(include_lint: bool = True) -> List[List[str]]:
+    """Return the Python formatting commands, in the order they must run."""
+    if importlib.util.find_spec("black") and importlib.util.find_spec("isort"):
+        commands = [[sys.executable, "-c", _PYTHON_FORMAT_SCRIPT]]
+    else:
+        commands = [["black", "."], ["isort", "."]]
+    if include_lint:
+        commands.append(RUFF_FIX_CMD)
+    return commands
+
+
+def describe_command(command: List[str]) -> str:
+    """Return a short human-readable form of a command."""
+    if command[-1] == _PYTHON_FORMAT_SCRIPT:
+        return "black . && isort ."
+    return " ".join(command)
 
 
 class GitManager:
     def __init__(self):
+        self.root_dir = ROOT_DIR
+        self.repo = self._open_repo()
         self.current_branch = self._get_current_branch()
-        self.root_dir = Path(__file__).parent.parent
+
+    @staticmethod
+    def _open_repo():
+        """Open the current repository with pygit2, or None if unavailable."""
+        try:
+            import pygit2
+        except ImportError:
+            return None
+
+        try:
+            repo_path = pygit2.discover_repository(".")
+            return pygit2.Repository(repo_path) if repo_path else None
+        except pygit2.GitError:
+            return None
 
     def _run_command(self, command: List[str], check: bool = True) -> bool:
         try:
-            subprocess.run(command, check=check,
-                           capture_output=True, text=True)
+            subprocess.run(_resolve_command(command), check=check,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                           close_fds=False)
             return True
         except subprocess.CalledProcessError as e:
-            click.echo(f"Error: {e.stderr}", err=True)
+            click.echo(f"Error: {_decode(e.stderr)}", err=True)
             return False
 
     def _get_current_branch(self) -> str:
+        # Read HEAD through the open pygit2 handle instead of forking git
+        if self.repo is not None:
+            import pygit2
+
+            try:
+                return self.repo.head.shorthand
+            except (pygit2.GitError, KeyError):
+                pass
+
         result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True,
-            text=True,
+            _resolve_command(["git", "rev-parse", "--abbrev-ref", "HEAD"]),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             check=False,
+            close_fds=False,
         )
-        return result.stdout.strip()
+        return result.stdout.rstrip(b"\n").decode("utf-8", "replace")
 
     def fetch_all(self) -> bool:
         click.echo("🔄 Fetching all changes...")
@@ -118,9 +472,9 @@ class GitManager:
                 "Please create a pull request from your feature branch to main.")
             return False
         elif target_branch != "dev":
-            click.echo(
-                f"⚠️  Warning: Pushing to {target_branch} instead of dev branch.")
-            click.echo("Consider pushing to dev branch instead.")
+            echo_lines(
+                f"⚠️  Warning: Pushing to {target_branch} instead of dev branch.",
+                "Consider pushing to dev branch instead.")
         return True
 
 
@@ -131,15 +485,10 @@ def cli():
 
 
 @cli.command()
-@click.argument("branch_type")
+@click.argument("branch_type", type=click.Choice(BRANCH_TYPES))
 @click.argument("branch_name")
 def create(branch_type, branch_name):
     """Create a new branch with proper naming convention"""
-    valid_types = ["feature", "bugfix", "release", "hotfix"]
-    if branch_type not in valid_types:
-        click.echo(f"Error: Branch type must be one of {valid_types}")
-        sys.exit(1)
-
     branch = f"{branch_type}/{branch_name}"
     success, _ = run_command(["git", "checkout", "-b", branch])
     if not success:
@@ -149,7 +498,9 @@ def create(branch_type, branch_name):
 
 @cli.command()
 @click.argument("target_branch", default="dev")
-def push(target_branch):
+@click.option("--force", is_flag=True,
+              help="Run all checks even if they passed for this working tree")
+def push(target_branch, force):
     """Push changes with pre-push checks"""
     # Check branch protection
     if target_branch == "main":
@@ -158,41 +509,48 @@ def push(target_branch):
             "Please create a pull request from your feature branch to main.")
         sys.exit(1)
 
-    # Run formatting
-    click.echo("Running code formatting...")
-    success, _ = run_command(["npm", "run", "format:all"])
-    if not success:
-        click.echo("❌ Code formatting failed")
-        sys.exit(1)
-
-    # Run Python formatting
-    click.echo("Running Python formatting...")
-    commands = [["black", "."], ["isort", "."],
-                ["ruff", "check", ".", "--fix"]]
-    for cmd in commands:
-        success, _ = run_command(cmd)
-        if not success:
-            click.echo(f"❌ Python formatting failed: {' '.join(cmd)}")
-            sys.exit(1)
-
-    # Verify build works
-    click.echo("Verifying build...")
-    success, _ = run_command(
-        ["npm", "run", "build", "--", "--no-lint"], capture_output=False
-    )
-    if not success:
+    # Pre-push checks as a small dependency graph: JS/TS and Python
+    # formatting run concurrently (the Python formatters rewrite the same
+    # files, so they stay sequential), then the build and tests, which only
+    # need formatting to have finished, run concurrently.
+    # Stages that already passed for this exact working tree are skipped.
+    build_cmd = ["npm", "run", "build", "--", "--no-lint"]
+    test_cmd = ["npm", "test", "--", "--passWithNoTests", "--coverage=false"]
+    stages = [
+        ("format", "Running code formatting", [
+            [["npm", "run", "format:all"]],
+            python_format_commands(),
+        ]),
+        ("build", "Verifying build and running tests", [[build_cmd], [test_cmd]]),
+    ]
+    key = _worktree_key()
+    passed = [] if force else load_passed_checks(key)
+    failed = None
+    for name, description, groups in stages:
+        if name in passed:
+            click.echo(f"{description}... skipped (passed for this tree)")
+            continue
+        click.echo(f"{description}...")
+        failed = run_command_groups(groups)
+        if failed:
+            break
+        # Formatting may rewrite files, so later stages see a new tree
+        if name == "format" and key is not None:
+            new_key = _worktree_key()
+            if new_key != key:
+                key = new_key
+                passed = [] if force else load_passed_checks(new_key)
+    if not failed:
+        save_passed_checks(key, [name for name, _, _ in stages])
+    if failed == build_cmd:
         click.echo("❌ Build verification failed")
         sys.exit(1)
-
-    # Run tests
-    click.echo("Running tests...")
-    success, output = run_command(
-        ["npm", "test", "--", "--passWithNoTests", "--coverage=false"],
-        capture_output=False,
-    )
-    if not success:
+    if failed == test_cmd:
         click.echo("❌ Tests failed")
         sys.exit(1)
+    if failed:
+        click.echo(f"❌ Code formatting failed: {describe_command(failed)}")
+        sys.exit(1)
 
     # Push changes
     click.echo(f"Pushing to {target_branch}...")
@@ -208,50 +566,54 @@ def push(target_branch):
 @cli.command()
 def format():
     """Format all code files"""
-    commands = [
-        # Python formatting
-        ["black", "."],
-        ["isort", "."],
-        ["ruff", "check", ".", "--fix"],
+    groups = [
+        # Python formatting (same files, so run in order)
+        python_format_commands(include_lint=False),
         # JS/TS formatting if npm exists
-        ["npm", "run", "format:all"]
+        [["npm", "run", "format:all"]],
     ]
 
-    for cmd in commands:
-        click.echo(f"Running: {' '.join(cmd)}")
-        success, _ = run_command(cmd, capture_output=False)
-        if not success:
-            click.echo(f"❌ Formatting failed: {' '.join(cmd)}")
-            sys.exit(1)
+    for group in groups:
+        for cmd in group:
+            click.echo(f"Running: {describe_command(cmd)}")
+
+    failed = run_command_groups(groups)
+    if failed:
+        click.echo(f"❌ Formatting failed: {describe_command(failed)}")
+        sys.exit(1)
 
-    click.echo("✅ All code formatting completed!")
+    # ruff runs last, so hand the process over to it rather than waiting;
+    # its exit status is the command's, so success isn't announced here
+    click.echo(f"Formatting done, running: {describe_command(RUFF_FIX_CMD)}")
+    exec_command(RUFF_FIX_CMD)
 
 
 @cli.command()
 def setup():
     """Setup development environment"""
-    # Create virtual environment
+    venv_cmd = ["python", "-m", "venv", ".venv"]
+    pip_cmd = [".venv/bin/pip", "install", "-e", ".", "-r", "requirements.txt"]
+    npm_cmd = ["npm", "install"]
+
+    # The Python environment and npm dependencies live in separate
+    # directories, so install them concurrently
     click.echo("Creating Python virtual environment...")
-    success, _ = run_command(["python", "-m", "venv", ".venv"])
-    if not success:
+    click.echo("Installing Python dependencies...")
+    groups = [[venv_cmd, pip_cmd]]
+    if Path("package.json").exists():
+        click.echo("Installing npm dependencies...")
+        groups.append([npm_cmd])
+
+    failed = run_command_groups(groups)
+    if failed == venv_cmd:
         click.echo("❌ Failed to create virtual environment")
         sys.exit(1)
-
-    # Install Python dependencies
-    click.echo("Installing Python dependencies...")
-    pip_cmd = [".venv/bin/pip", "install", "-e", ".", "-r", "requirements.txt"]
-    success, _ = run_command(pip_cmd)
-    if not success:
+    if failed == pip_cmd:
         click.echo("❌ Failed to install Python dependencies")
         sys.exit(1)
-
-    # Try to install npm dependencies if package.json exists
-    if Path("package.json").exists():
-        click.echo("Installing npm dependencies...")
-        success, _ = run_command(["npm", "install"])
-        if not success:
-            click.echo("❌ Failed to install npm dependencies")
-            sys.exit(1)
+    if failed == npm_cmd:
+        click.echo("❌ Failed to install npm dependencies")
+        sys.exit(1)
 
     click.echo("✅ Development environment setup complete!")
     click.echo("Activate the virtual environment with 'source .venv/bin/activate'")
@@ -264,7 +626,8 @@ def status():
     click.echo("📊 Git Status:")
     run_command(["git", "status"], capture_output=False)
 
-    # Check Python version
+    # Check the project's Python version (the python on PATH, which may not
+    # be the interpreter running devkit); run_command looks it up via _which
     click.echo("\n📊 Python Version:")
     run_command(["python", "--version"], capture_output=False)
 
@@ -276,15 +639,20 @@ def status():
         click.echo("❌ Virtual environment not found")
 
     # Check if npm is installed
-    try:
-        click.echo("\n📊 Node.js Status:")
-        run_command(["npm", "--version"], capture_output=False)
-        if Path("package.json").exists():
-            click.echo("✅ package.json found")
-        else:
-            click.echo("❌ package.json not found")
-    except:
+    click.echo("\n📊 Node.js Status:")
+    if not _which("npm"):
         click.echo("❌ npm not installed")
+        return
+
+    run_command(["npm", "--version"], capture_output=False)
+    if Path("package.json").exists():
+        click.echo("✅ package.json found")
+        if Path("node_modules").is_dir():
+            click.echo("✅ node_modules found")
+        else:
+            click.echo("❌ node_modules not found (run 'npm install')")
+    else:
+        click.echo("❌ package.json not found")
 
 
 @cli.group()
@@ -353,17 +721,11 @@ def bump(version_type, no_commit, no_tag, tag_message, push):
 
 
 @version.command()
-@click.argument("version")
+@click.argument("version", callback=_validate_semver)
 @click.option("--tag-message", help="Custom tag message")
 @click.option("--push", is_flag=True, help="Push tag to remote repository")
 def set(version, tag_message, push):
     """Set specific version"""
-    # Validate version format
-    if not version.replace(".", "").isdigit():
-        click.echo(
-            "❌ Invalid version format. Use semantic versioning (e.g., 1.2.3)")
-        sys.exit(1)
-
     # Get current version
     current_version = get_current_version()
     click.echo(f"Current version: {current_version}")
@@ -402,11 +764,13 @@ def set(version, tag_message, push):
 @cli.group()
 def docker():
     """Docker image management"""
-    if not DOCKER_AVAILABLE:
-        click.echo("❌ Docker functionality not available.")
-        click.echo("Make sure the docker module is installed.")
+    if not _docker_available():
+        echo_lines("❌ Docker functionality not available.",
+                   "Make sure the docker module is installed.")
         sys.exit(1)
 
+    from devkit.docker import check_docker_installed
+
     if not check_docker_installed():
         click.echo("❌ Docker is not installed or not in PATH.")
         sys.exit(1)
@@ -418,14 +782,17 @@ def docker():
 @click.option("--name", help="Name for the image (default: project name)")
 @click.option("--no-cache", is_flag=True, help="Disable Docker build cache")
 @click.option("--platform", help="Target platform (e.g., linux/amd64)")
-def build(dockerfile, context, name, no_cache, platform):
+@click.option("--cache-from", multiple=True,
+              help="Registry image to import build cache from (repeatable)")
+@click.option("--cache-to", help="Registry image to export build cache to")
+def build(dockerfile, context, name, no_cache, platform, cache_from, cache_to):
     """Build Docker image"""
+    from devkit.docker import DockerError, build_docker_image, default_image_name
+
     try:
         # Use project name if name not provided
         if not name:
-            project_name = Path.cwd().name
-            version = get_current_version()
-            name = f"{project_name}:{version}"
+            name = default_image_name()
 
         click.echo(f"🔨 Building Docker image {name}...")
 
@@ -434,7 +801,9 @@ def build(dockerfile, context, name, no_cache, platform):
             context_path=context,
             image_name=name,
             cache=not no_cache,
-            platform=platform
+            platform=platform,
+            cache_from=list(cache_from),
+            cache_to=cache_to
         )
 
         click.echo(f"✅ Built Docker image: {image_name}")
@@ -452,6 +821,13 @@ def build(dockerfile, context, name, no_cache, platform):
 @click.option("--chainguard", is_flag=True, help="Include Chainguard-specific tags")
 def tag(source_image, registry_path, push, no_latest, chainguard):
     """Tag Docker image with semantic versions"""
+    from devkit.docker import (
+        DockerError,
+        generate_docker_tags,
+        push_image_with_tags,
+        tag_docker_image,
+    )
+
     try:
         # Get version from the current package
         version = get_current_version()
@@ -464,9 +840,8 @@ def tag(source_image, registry_path, push, no_latest, chainguard):
             chainguard_tags=chainguard
         )
 
-        click.echo(f"🔖 Tagging Docker image {source_image} with:")
-        for tag in tags:
-            click.echo(f"  - {tag}")
+        echo_lines(f"🔖 Tagging Docker image {source_image} with:",
+                   *(f"  - {tag}" for tag in tags))
 
         # Tag the images
         tagged_images = tag_docker_image(source_image, tags)
@@ -480,7 +855,8 @@ def tag(source_image, registry_path, push, no_latest, chainguard):
         # Push images if requested
         if push:
             click.echo("🚀 Pushing images to registry...")
-            pushed_images = push_docker_image(tags)
+            pushed_images = push_image_with_tags(
+                tagged_images[0], tagged_images[1:])
 
             if not pushed_images:
                 click.echo("❌ Failed to push any images")
@@ -501,31 +877,75 @@ def tag(source_image, registry_path, push, no_latest, chainguard):
 @click.option("--no-latest", is_flag=True, help="Don't include latest tag")
 @click.option("--push", is_flag=True, help="Push images to registry")
 @click.option("--chainguard", is_flag=True, help="Include Chainguard-specific tags")
-@click.option("--platform", help="Target platform (e.g., linux/amd64)")
+@click.option("--platform",
+              help="Target platform(s), comma-separated (e.g., linux/amd64,linux/arm64); "
+                   "multiple platforms require --push")
 @click.option("--test", is_flag=True, help="Test the image after building")
 def release(dockerfile, context, registry, no_cache, no_latest, push, chainguard, platform, test):
     """Build, tag and optionally push Docker image"""
+    from devkit.docker import (
+        DockerError,
+        build_and_push_docker_image,
+        build_docker_image,
+        check_buildx_installed,
+        generate_docker_tags,
+        project_name,
+        push_image_with_tags,
+        test_docker_image,
+    )
+
     try:
         # Get version
         version = get_current_version()
 
         # Use project name if registry not provided
         if not registry:
-            registry = Path.cwd().name
+            registry = project_name()
 
-        # First build the image
+        # Generate tags up front so the build applies all of them at once
+        tags = generate_docker_tags(
+            registry,
+            version,
+            include_latest=not no_latest,
+            chainguard_tags=chainguard
+        )
+
+        # The main tag is the image name itself; the rest are extra -t flags
         image_name = f"{registry}:{version}"
+        tags = [tag for tag in tags if tag != image_name]
+
         click.echo(f"🔨 Building Docker image {image_name}...")
+        if tags:
+            echo_lines("🔖 Tagging Docker image with additional tags:",
+                       *(f"  - {tag}" for tag in tags))
+
+        # Without a local test step, buildx can build, tag and push in one
+        # BuildKit session, reusing the previous release's inline cache
+        if push and not test and check_buildx_installed():
+            pushed_images = build_and_push_docker_image(
+                [image_name, *tags],
+                dockerfile_path=dockerfile,
+                context_path=context,
+                cache=not no_cache,
+                platform=platform,
+                cache_from=None if no_latest else f"{registry}:latest"
+            )
+            click.echo(
+                f"✅ Built and pushed {len(pushed_images)} Docker images")
+            return
 
         built_image = build_docker_image(
             dockerfile_path=dockerfile,
             context_path=context,
             image_name=image_name,
             cache=not no_cache,
-            platform=platform
+            platform=platform,
+            extra_tags=tags
         )
 
         click.echo(f"✅ Built Docker image: {built_image}")
+        if tags:
+            click.echo(f"✅ Tagged {len(tags)} additional Docker images")
 
         # Test the image if requested
         if test:
@@ -534,42 +954,13 @@ def release(dockerfile, context, registry, no_cache, no_latest, push, chainguard
             if not success:
                 click.echo(f"❌ Docker image test failed: {output}")
                 sys.exit(1)
-            click.echo(f"✅ Docker image test passed")
-            click.echo(output)
-
-        # Generate tags
-        tags = generate_docker_tags(
-            registry,
-            version,
-            include_latest=not no_latest,
-            chainguard_tags=chainguard
-        )
-
-        # Filter out the main tag which is already built
-        tags = [tag for tag in tags if tag != built_image]
-
-        if tags:
-            click.echo(f"🔖 Tagging Docker image with additional tags:")
-            for tag in tags:
-                click.echo(f"  - {tag}")
-
-            # Tag the images
-            tagged_images = tag_docker_image(built_image, tags)
-
-            if not tagged_images:
-                click.echo("❌ Failed to tag any images")
-                sys.exit(1)
-
-            click.echo(
-                f"✅ Tagged {len(tagged_images)} additional Docker images")
+            echo_lines("✅ Docker image test passed", output)
 
         # Push images if requested
         if push:
-            # Include the built image in the push
-            all_tags = [built_image] + tags
-
+            # Push the built image once and publish the other tags for it
             click.echo("🚀 Pushing images to registry...")
-            pushed_images = push_docker_image(all_tags)
+            pushed_images = push_image_with_tags(built_image, tags)
 
             if not pushed_images:
                 click.echo("❌ Failed to push any images")
@@ -587,20 +978,21 @@ def release(dockerfile, context, registry, no_cache, no_latest, push, chainguard
 @click.option("--command", "-c", help="Command to run in the container")
 def test(image_name, command):
     """Test a Docker image by running it with a command"""
+    from devkit.docker import DockerError, test_docker_image
+
     try:
         click.echo(f"🧪 Testing Docker image {image_name}...")
 
         test_cmd = None
         if command:
-            test_cmd = command.split()
+            test_cmd = shlex.split(command)
 
         success, output = test_docker_image(image_name, test_cmd)
         if not success:
             click.echo(f"❌ Docker image test failed: {output}")
             sys.exit(1)
 
-        click.echo(f"✅ Docker image test passed")
-        click.echo(output)
+        echo_lines("✅ Docker image test passed", output)
     except DockerError as e:
         click.echo(f"❌ {e}")
         sys.exit(1)
@@ -612,16 +1004,21 @@ def test(image_name, command):
               help="Output format")
 def scan(image_name, output):
     """Scan a Docker image for vulnerabilities"""
+    from devkit.docker import DockerError, ScanError, scan_docker_image
+
     try:
         click.echo(
             f"🔍 Scanning Docker image {image_name} for vulnerabilities...")
 
         success, scan_results = scan_docker_image(
-            image_name, output_format=output)
+            image_name, output_format=output, include_raw=output == "json")
 
         if output == "json":
-            # For JSON output, print the formatted result
-            click.echo(json.dumps(scan_results, indent=2))
+            # For JSON output, stream the formatted result instead of
+            # building the whole document as one string first
+            stdout = click.get_text_stream("stdout")
+            json.dump(scan_results, stdout, indent=2)
+            stdout.write("\n")
         else:
             # For text output, just print the result directly
             click.echo(scan_results)
@@ -632,6 +1029,9 @@ def scan(image_name, output):
             sys.exit(1)
         else:
             click.echo("✅ No critical vulnerabilities found")
+    except ScanError as e:
+        click.echo(f"❌ Vulnerability scan failed: {e}")
+        sys.exit(1)
     except DockerError as e:
         click.echo(f"❌ {e}")
         sys.exit(1)
@@ -645,6 +1045,8 @@ def scan(image_name, output):
               help="SBOM format")
 def sbom(image_name, output_file, format):
     """Generate SBOM for a Docker image"""
+    from devkit.docker import generate_sbom
+
     try:
         click.echo(f"📄 Generating SBOM for {image_name}...")
 
@@ -665,6 +1067,8 @@ def sbom(image_name, output_file, format):
 @click.option("--key", "-k", help="Path to Cosign private key")
 def sign(image_name, key):
     """Sign a Docker image with Cosign"""
+    from devkit.docker import sign_image
+
     try:
         click.echo(f"🔏 Signing image {image_name}...")
 
@@ -685,6 +1089,8 @@ def sign(image_name, key):
 @click.option("--key", "-k", help="Path to Cosign public key")
 def verify(image_name, key):
     """Verify a Docker image signature"""
+    from devkit.docker import verify_image_signature
+
     try:
         click.echo(f"🔍 Verifying signature for {image_name}...")
 
@@ -694,8 +1100,7 @@ def verify(image_name, key):
             click.echo(f"❌ Signature verification failed: {output}")
             sys.exit(1)
 
-        click.echo(f"✅ Signature verified successfully")
-        click.echo(output)
+        echo_lines("✅ Signature verified successfully", output)
     except Exception as e:
         click.echo(f"❌ Error verifying signature: {e}")
         sys.exit(1)
@@ -714,24 +1119,30 @@ def verify(image_name, key):
 @click.option("--json", "json_output", is_flag=True, help="Output results as JSON")
 def secure(dockerfile, context, name, registry, build_args, policy, k8s_manifest, signing_key, push, json_output):
     """Run a complete secure delivery pipeline"""
+    from devkit.docker import default_image_name, secure_pipeline
+
     try:
         # Parse build args if provided
-        build_args_dict = {}
-        if build_args:
-            for arg_pair in build_args.split(","):
-                key, value = arg_pair.split("=", 1)
-                build_args_dict[key] = value
+        build_args_dict = dict(_BUILD_ARG_RE.findall(
+            build_args)) if build_args else {}
 
         # Generate name if not provided
         if not name:
-            project_name = Path.cwd().name
-            version = get_current_version()
-            name = f"{project_name}:{version}"
+            name = default_image_name()
 
         # Convert policy list to None if empty
         policy_files = list(policy) if policy else None
 
-        click.echo("🔒 Running secure delivery pipeline...")
+        # With --json, stdout carries only the results; progress and
+        # problems go to stderr
+        click.echo("🔒 Running secure delivery pipeline...", err=json_output)
+
+        # The pipeline reports progress through logging; with --json only
+        # problems are logged
+        logging.basicConfig(
+            level=logging.WARNING if json_output else logging.INFO,
+            format="%(message)s",
+            stream=sys.stderr if json_output else sys.stdout)
 
         # Run the secure pipeline
         results = secure_pipeline(
@@ -743,7 +1154,8 @@ def secure(dockerfile, context, name, registry, build_args, policy, k8s_manifest
             policy_files=policy_files,
             k8s_manifest=k8s_manifest,
             signing_key=signing_key,
-            push=push
+            push=push,
+            output=sys.stderr if json_output else None
         )
 
         # Output results
@@ -761,13 +1173,26 @@ def secure(dockerfile, context, name, registry, build_args, policy, k8s_manifest
         if "policy" in results and not results["policy"]["success"]:
             sys.exit(1)
 
-        click.echo("✅ Secure delivery pipeline completed successfully!")
+        click.echo("✅ Secure delivery pipeline completed successfully!", err=json_output)
     except Exception as e:
-        click.echo(f"❌ Secure pipeline failed: {str(e)}")
+        click.echo(f"❌ Secure pipeline failed: {str(e)}", err=json_output)
         sys.exit(1)
 
 # Health check endpoints for Kubernetes probes
 
+# Probes fire every few seconds per pod, so responses are rendered from a
+# fixed template rather than building a dict and serialising it each time
+_PROBE_TEMPLATE = '{{"status": "{status}", "version": {version}, "timestamp": "{timestamp}"}}'
+
+
+def _probe_response(status: str) -> str:
+    """Render a successful probe response for the given status."""
+    return _PROBE_TEMPLATE.format(
+        status=status,
+        version=json.dumps(get_current_version()),
+        timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )
+
 
 @cli.group()
 def health():
@@ -780,12 +1205,7 @@ def live():
     """Liveness probe endpoint"""
     try:
         # Check if the process is alive and responsive
-        version = get_current_version()
-        click.echo(json.dumps({
-            "status": "ok",
-            "version": version,
-            "timestamp": subprocess.check_output(["date", "-u", "+%Y-%m-%dT%H:%M:%SZ"]).decode().strip()
-        }))
+        click.echo(_probe_response("ok"))
     except Exception as e:
         click.echo(json.dumps({
             "status": "error",
@@ -808,11 +1228,7 @@ def ready():
         # dependencies_ok = dependencies_ok and db_connection
 
         if dependencies_ok:
-            click.echo(json.dumps({
-                "status": "ready",
-                "version": get_current_version(),
-                "timestamp": subprocess.check_output(["date", "-u", "+%Y-%m-%dT%H:%M:%SZ"]).decode().strip()
-            }))
+            click.echo(_probe_response("ready"))
         else:
             click.echo(json.dumps({
                 "status": "not_ready",
@@ -832,11 +1248,7 @@ def started():
     """Startup probe endpoint"""
     try:
         # Check if the application has completed startup procedures
-        click.echo(json.dumps({
-            "status": "started",
-            "version": get_current_version(),
-            "timestamp": subprocess.check_output(["date", "-u", "+%Y-%m-%dT%H:%M:%SZ"]).decode().strip()
-        }))
+        click.echo(_probe_response("started"))
     except Exception as e:
         click.echo(json.dumps({
             "status": "error",
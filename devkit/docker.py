@@ -1,13 +1,55 @@
 #!/usr/bin/env python3
 
+import contextlib
+import functools
+import http.client
+import logging
 import os
+import secrets
+import shutil
+import socket
+import stat
 import subprocess
+import sys
 import time
 import json
 import tempfile
-from typing import List, Optional, Dict, Tuple, Union
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from urllib.parse import quote
+from typing import Deque, Iterable, Iterator, List, Optional, Dict, TextIO, Tuple, Union
 
-from devkit.versioning import get_current_version
+from devkit.versioning import get_current_version, get_git_commit_hash
+
+logger = logging.getLogger(__name__)
+
+# Default bound on concurrent docker push/tag processes, matching dockerd's
+# default max-concurrent-uploads. DEVKIT_PUSH_PARALLELISM overrides it, e.g.
+# for registries that throttle concurrent uploads with 429s.
+MAX_PUSH_WORKERS = 5
+
+# Lines of streamed output kept for error messages
+OUTPUT_TAIL_LINES = 200
+
+# Docker daemon address used when DOCKER_HOST is not set
+DEFAULT_DOCKER_HOST = "unix:///var/run/docker.sock"
+
+# Seconds to wait for a local Trivy server to start; the first start may
+# need to download the vulnerability database
+TRIVY_SERVER_TIMEOUT = 120
+
+# Label applied to containers started by test_docker_image
+TEST_CONTAINER_LABEL = "devkit=test"
+
+# Exit code Trivy is asked to use when it finds critical vulnerabilities;
+# distinct from 1, which Trivy also uses for its own errors
+TRIVY_FINDINGS_EXIT_CODE = 5
+
+# Tag under a pipeline's registry that holds its exported build cache
+BUILD_CACHE_TAG = "buildcache"
 
 
 class DockerError(Exception):
@@ -15,43 +57,386 @@ class DockerError(Exception):
     pass
 
 
+class ScanError(DockerError):
+    """Exception raised when a vulnerability scanner fails to run a scan"""
+    pass
+
+
+def _max_workers() -> int:
+    """Return the number of docker processes that may run concurrently"""
+    try:
+        return max(1, int(os.environ.get("DEVKIT_PUSH_PARALLELISM", MAX_PUSH_WORKERS)))
+    except ValueError:
+        return MAX_PUSH_WORKERS
+
+
+def _unique(items: Iterable[str]) -> Iterator[str]:
+    """Yield items lazily, skipping any already seen"""
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
+def _run_concurrently(
+    func, items: Iterable[str], max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Apply func to every item on a thread pool
+
+    Work is submitted as items are produced, so a lazy iterable overlaps
+    with the first operations instead of being collected up front.
+
+    Returns:
+        List[str]: Items for which func returned True, in input order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or _max_workers()) as executor:
+        futures = [(item, executor.submit(func, item)) for item in items]
+        return [item for item, future in futures if future.result()]
+
+
+@functools.lru_cache(maxsize=1)
+def project_name() -> str:
+    """
+    Get the project name (the current directory name)
+
+    It is resolved once and cached for the process.
+
+    Returns:
+        str: The project name
+    """
+    return Path.cwd().name
+
+
+def default_image_name() -> str:
+    """
+    Get the default image name for the current project
+
+    Both parts are cached: the project name for the process, and the
+    version until it is next updated by devkit.versioning.
+
+    Returns:
+        str: Image name in the form <project name>:<version>
+    """
+    return f"{project_name()}:{get_current_version()}"
+
+
+@functools.lru_cache(maxsize=1)
+def _docker_client():
+    """
+    Get a shared Docker SDK client for the local daemon
+
+    The client is cached, so it must only be used from one thread at a
+    time; concurrent work creates its own clients with _new_docker_client().
+
+    Returns:
+        A docker.DockerClient, or None if the SDK or daemon is unavailable
+    """
+    return _new_docker_client()
+
+
+def _new_docker_client():
+    """
+    Create a Docker SDK client for the local daemon
+
+    The SDK is optional and imported lazily, since it is slow to import.
+
+    Returns:
+        A docker.DockerClient, or None if the SDK or daemon is unavailable
+    """
+    try:
+        import docker as docker_sdk
+    except ImportError:
+        return None
+
+    try:
+        return docker_sdk.from_env()
+    except docker_sdk.errors.DockerException:
+        return None
+
+
+def _split_image_tag(image: str) -> Tuple[str, str]:
+    """
+    Split an image reference into repository and tag
+
+    Args:
+        image: Image reference (e.g., registry:5000/org/name:1.2.3)
+
+    Returns:
+        Tuple[str, str]: Repository and tag ("latest" if none is given)
+    """
+    repository, _, tag = image.rpartition(":")
+    # A colon followed by a path belongs to a registry port, not a tag
+    if not repository or "/" in tag:
+        return image, "latest"
+    return repository, tag
+
+
+def _check_dockerfile(dockerfile_path: str) -> None:
+    """
+    Check that a Dockerfile exists and is readable before starting a build
+
+    Args:
+        dockerfile_path: Path to the Dockerfile
+
+    Raises:
+        DockerError: If the path is missing, not a regular file, or unreadable
+    """
+    try:
+        mode = os.stat(dockerfile_path).st_mode
+    except OSError:
+        raise DockerError(f"Dockerfile not found at {dockerfile_path}")
+    if not stat.S_ISREG(mode):
+        raise DockerError(f"Dockerfile at {dockerfile_path} is not a regular file")
+    if not os.access(dockerfile_path, os.R_OK):
+        raise DockerError(f"Dockerfile at {dockerfile_path} is not readable")
+
+
+def _build_arg_flags(build_args: Optional[dict]) -> List[str]:
+    """Return '--build-arg KEY=VALUE' flags for a dict of build arguments"""
+    return list(chain.from_iterable(
+        ("--build-arg", f"{key}={value}") for key, value in (build_args or {}).items()))
+
+
+def _tag_flags(tags: List[str]) -> List[str]:
+    """Return '-t TAG' flags for a list of tags"""
+    return list(chain.from_iterable(("-t", tag) for tag in tags))
+
+
+def _platform_list(platform: Optional[Union[str, List[str]]]) -> List[str]:
+    """
+    Normalize a platform argument to a list of platforms
+
+    Args:
+        platform: A platform, a comma-separated string of them, or a list
+
+    Returns:
+        List[str]: The platforms, empty if none were given
+    """
+    if not platform:
+        return []
+    if isinstance(platform, str):
+        platform = platform.split(",")
+    return [p.strip() for p in platform if p.strip()]
+
+
+def _stream_command(
+    cmd: List[str],
+    env: Optional[Dict[str, str]] = None,
+    output: Optional[TextIO] = None,
+) -> Tuple[int, str]:
+    """
+    Run a command, echoing its combined output as it arrives
+
+    The output is always drained, even if the echo stream is closed, so the
+    command never blocks on a full pipe.
+
+    Args:
+        cmd: Command to run
+        env: Environment for the command (optional, defaults to ours)
+        output: Stream to echo the output to (optional, defaults to stdout)
+
+    Returns:
+        Tuple[int, str]: Exit code and the last lines of output
+    """
+    tail: Deque[bytes] = deque(maxlen=OUTPUT_TAIL_LINES)
+    out = (output or sys.stdout).buffer
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          env=env) as proc:
+        for line in proc.stdout:
+            if out is not None:
+                try:
+                    out.write(line)
+                    out.flush()
+                except (BrokenPipeError, ValueError):
+                    # Keep collecting the tail without echoing
+                    out = None
+            tail.append(line)
+    return proc.returncode, b"".join(tail).decode(errors="replace")
+
+
+def _parse_json_stream(stream):
+    """Parse one JSON document from a binary stream, incrementally if ijson is available"""
+    try:
+        import ijson
+    except ImportError:
+        return json.load(stream)
+
+    try:
+        # use_float keeps numbers as floats, matching the json module
+        return next(ijson.items(stream, "", use_float=True), None)
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+
+def _loads_json(data: bytes):
+    """Parse a JSON document from bytes, with orjson if it is available"""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(data)
+
+
+def _count_severities(stream) -> Dict[str, int]:
+    """
+    Count vulnerabilities by severity in a Trivy JSON report read from a stream
+
+    With the optional ijson package only the severity strings are extracted
+    as the report streams by, so no document is ever built.
+
+    Args:
+        stream: Binary stream with a Trivy JSON report
+
+    Returns:
+        Dict[str, int]: Vulnerability counts per severity
+    """
+    try:
+        import ijson
+    except ImportError:
+        return _tally_severities(_report_severities(json.load(stream)))
+
+    try:
+        return _tally_severities(
+            ijson.items(stream, "Results.item.Vulnerabilities.item.Severity"))
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+
+def _report_severities(scan_data: Dict) -> Iterator[str]:
+    """Yield the severity of every vulnerability in a parsed Trivy report"""
+    for results in scan_data.get("Results") or []:
+        for vuln in results.get("Vulnerabilities") or []:
+            yield vuln.get("Severity", "UNKNOWN")
+
+
+def _tally_severities(severities: Iterable[str]) -> Dict[str, int]:
+    """Count severities into the fixed set reported by scan_docker_image"""
+    vuln_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "UNKNOWN": 0}
+    for severity in severities:
+        if severity in vuln_counts:
+            vuln_counts[severity] += 1
+    return vuln_counts
+
+
+def _read_json_output(cmd: List[str], parse=_parse_json_stream):
+    """
+    Run a command and parse its JSON output as it is read from the pipe
+
+    With the optional ijson package the document is built incrementally, so
+    the raw report is never held in memory alongside the parsed one. stderr
+    goes to a temporary file rather than a second pipe, so a chatty command
+    can't block on it while its stdout is being parsed.
+
+    Args:
+        cmd: Command to run
+        parse: Function that parses the binary stdout stream (optional,
+            defaults to parsing the whole document)
+
+    Returns:
+        The parsed JSON document, or whatever parse returns
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits non-zero
+    """
+    with tempfile.TemporaryFile() as stderr:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr) as proc:
+            try:
+                data = parse(proc.stdout)
+            except ValueError:
+                data = None
+            # Drain anything left so the command can exit
+            proc.stdout.read()
+        if proc.returncode != 0 or data is None:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                proc.returncode, cmd,
+                stderr=stderr.read().decode(errors="replace"))
+    return data
+
+
+@functools.lru_cache(maxsize=None)
 def check_docker_installed() -> bool:
     """
     Check if Docker is installed and available
 
+    The result is cached for the lifetime of the process.
+
     Returns:
         bool: True if Docker is installed, False otherwise
     """
-    try:
-        subprocess.run(
-            ["docker", "--version"],
-            capture_output=True,
-            check=True
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    return check_tool_installed("docker")
 
 
+@functools.lru_cache(maxsize=None)
 def check_tool_installed(tool_name: str) -> bool:
     """
     Check if a tool is installed and available
 
+    Results are cached per tool for the lifetime of the process. This is a
+    PATH lookup rather than running '<tool> --version', so no process is
+    spawned.
+
     Args:
         tool_name: Name of the tool to check
 
     Returns:
         bool: True if the tool is installed, False otherwise
     """
+    return shutil.which(tool_name) is not None
+
+
+@functools.lru_cache(maxsize=None)
+def check_buildx_installed() -> bool:
+    """
+    Check if the Docker buildx plugin is installed and available
+
+    The result is cached for the lifetime of the process.
+
+    Returns:
+        bool: True if buildx is available, False otherwise
+    """
     try:
         subprocess.run(
-            [tool_name, "--version"],
+            ["docker", "buildx", "version"],
             capture_output=True,
             check=True
         )
         return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    except (subprocess.SubprocessError, OSError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def check_buildx_cache_export() -> bool:
+    """
+    Check if the active buildx builder can export build cache
+
+    The default 'docker' driver rejects cache export; container-based
+    drivers (docker-container, kubernetes, remote) support it. The result is
+    cached for the lifetime of the process.
+
+    Returns:
+        bool: True if cache can be exported, False otherwise
+    """
+    if not check_buildx_installed():
+        return False
+    try:
+        result = subprocess.run(
+            ["docker", "buildx", "inspect"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except (subprocess.SubprocessError, OSError):
         return False
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "Driver":
+            return value.strip() != "docker"
+    return False
 
 
 def build_docker_image(
@@ -60,18 +445,33 @@ def build_docker_image(
     image_name: Optional[str] = None,
     build_args: Optional[dict] = None,
     cache: bool = True,
-    platform: Optional[str] = None,
+    platform: Optional[Union[str, List[str]]] = None,
+    extra_tags: Optional[List[str]] = None,
+    cache_from: Optional[List[str]] = None,
+    cache_to: Optional[str] = None,
+    buildkit: bool = True,
+    output: Optional[TextIO] = None,
 ) -> str:
     """
     Build a Docker image
 
+    Builds use BuildKit by default when docker buildx is available, and the
+    classic builder otherwise. Exporting a registry cache with cache_to
+    needs buildx, so the build then runs through 'docker buildx build --load'.
+
     Args:
         dockerfile_path: Path to the Dockerfile
         context_path: Path to the build context
         image_name: Name for the image (optional)
         build_args: Dictionary of build arguments (optional)
         cache: Whether to use Docker build cache
-        platform: Target platform (e.g., linux/amd64, linux/arm64)
+        platform: Target platform (e.g., linux/amd64); multi-platform images
+            can't be loaded locally, so use build_and_push_docker_image for them
+        extra_tags: Additional tags to apply in the same build (optional)
+        cache_from: Registry image references to import build cache from (optional)
+        cache_to: Registry image reference to export build cache to (optional)
+        buildkit: Whether to build with BuildKit (if docker buildx is available)
+        output: Stream for the build log (optional, defaults to stdout)
 
     Returns:
         str: The built image name with tag
@@ -79,49 +479,175 @@ def build_docker_image(
     Raises:
         DockerError: If Docker build fails
     """
+    cmd, image_name, env = _build_command(
+        dockerfile_path, context_path, image_name, build_args, cache,
+        platform, extra_tags, cache_from, cache_to, buildkit)
+
+    # The classic builder only uses cache images that are present locally
+    if cache and cache_from and env["DOCKER_BUILDKIT"] == "0":
+        _pull_missing_images(cache_from)
+
+    # Stream the build log, keeping its tail for errors
+    returncode, output_tail = _stream_command(cmd, env=env, output=output)
+    if returncode != 0:
+        raise DockerError(
+            f"Docker build failed with exit code {returncode}:\n{output_tail}")
+    return image_name
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix socket, for talking to the Docker daemon"""
+
+    def __init__(self, socket_path: str, timeout: float = 5):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _docker_socket_path() -> Optional[str]:
+    """Get the Docker daemon's Unix socket path, or None if it isn't a Unix socket"""
+    host = os.environ.get("DOCKER_HOST", DEFAULT_DOCKER_HOST)
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return None
+
+
+def _image_exists_local(image: str) -> Optional[bool]:
+    """
+    Check whether an image is in the local image store
+
+    Asks the Docker Engine API directly over its socket, which is one HTTP
+    request instead of spawning 'docker image inspect'.
+
+    Args:
+        image: Image reference
+
+    Returns:
+        Optional[bool]: Whether the image exists, or None if the daemon
+        could not be asked
+    """
+    socket_path = _docker_socket_path()
+    if socket_path is None:
+        return None
+
+    conn = _UnixHTTPConnection(socket_path)
+    try:
+        conn.request("GET", f"/images/{quote(image, safe='/:@')}/json")
+        status = conn.getresponse().status
+    except OSError:
+        return None
+    finally:
+        conn.close()
+
+    if status == 200:
+        return True
+    if status == 404:
+        return False
+    return None
+
+
+def _pull_missing_images(images: List[str]) -> None:
+    """
+    Pull images that are not available locally; failures are ignored
+
+    Args:
+        images: Image references
+    """
+    for image in images:
+        if _image_exists_local(image):
+            continue
+        subprocess.run(["docker", "pull", "--quiet", image],
+                       stdout=subprocess.DEVNULL, check=False)
+
+
+def _build_command(
+    dockerfile_path: str,
+    context_path: str,
+    image_name: Optional[str],
+    build_args: Optional[dict],
+    cache: bool,
+    platform: Optional[Union[str, List[str]]],
+    extra_tags: Optional[List[str]],
+    cache_from: Optional[List[str]],
+    cache_to: Optional[str],
+    buildkit: bool,
+) -> Tuple[List[str], str, Dict[str, str]]:
+    """
+    Validate build_docker_image arguments and assemble its command
+
+    Shared with the asyncio API in devkit.docker_async.
+
+    Returns:
+        Tuple[List[str], str, Dict[str, str]]: Command, image name and environment
+
+    Raises:
+        DockerError: If Docker is unavailable or the arguments are invalid
+    """
     if not check_docker_installed():
         raise DockerError("Docker is not installed or not in PATH")
 
-    if not os.path.exists(dockerfile_path):
-        raise DockerError(f"Dockerfile not found at {dockerfile_path}")
+    _check_dockerfile(dockerfile_path)
 
     # Generate image name if not provided
     if not image_name:
-        # Get the project name (current directory name)
-        project_name = os.path.basename(os.path.abspath("."))
-        version = get_current_version()
-        image_name = f"{project_name}:{version}"
+        image_name = default_image_name()
+
+    platforms = _platform_list(platform)
+    if len(platforms) > 1:
+        raise DockerError(
+            "Building for multiple platforms requires pushing with docker buildx")
+
+    if cache_to and not (buildkit and check_buildx_installed()):
+        raise DockerError("Exporting build cache requires BuildKit and docker buildx")
+
+    # Docker >= 23 refuses DOCKER_BUILDKIT=1 when the buildx component is
+    # missing instead of falling back, so use the classic builder without it
+    buildkit = buildkit and check_buildx_installed()
 
     # Prepare the build command
-    cmd = ["docker", "build"]
+    if cache_to:
+        cmd = ["docker", "buildx", "build", "--load"]
+    else:
+        cmd = ["docker", "build"]
+
+    # Plain progress logs each step once instead of repainting a TTY view,
+    # which is what we want when teeing the output (the classic builder has
+    # no --progress flag)
+    if buildkit:
+        cmd.append("--progress=plain")
 
     # Add build args
-    if build_args:
-        for key, value in build_args.items():
-            cmd.extend(["--build-arg", f"{key}={value}"])
+    cmd.extend(_build_arg_flags(build_args))
 
     # Add platform if specified
-    if platform:
-        cmd.extend(["--platform", platform])
+    if platforms:
+        cmd.extend(["--platform", platforms[0]])
 
-    # Add image name (tag)
-    cmd.extend(["-t", image_name])
+    # Add image name (tag) and any extra tags
+    cmd.extend(_tag_flags([image_name, *(extra_tags or [])]))
 
     # Add Dockerfile path
     cmd.extend(["-f", dockerfile_path])
 
-    # Disable cache if needed
-    if not cache:
+    # Import/export registry cache, or disable cache if needed
+    if cache:
+        for ref in cache_from or []:
+            cmd.extend(["--cache-from",
+                        f"type=registry,ref={ref}" if buildkit else ref])
+        if cache_to:
+            cmd.extend(["--cache-to", f"type=registry,ref={cache_to},mode=max"])
+    else:
         cmd.append("--no-cache")
 
     # Add context path
     cmd.append(context_path)
 
-    try:
-        subprocess.run(cmd, check=True)
-        return image_name
-    except subprocess.CalledProcessError as e:
-        raise DockerError(f"Docker build failed: {e}")
+    env = {**os.environ, "DOCKER_BUILDKIT": "1" if buildkit else "0"}
+    return cmd, image_name, env
 
 
 def tag_docker_image(
@@ -144,27 +670,149 @@ def tag_docker_image(
     if not check_docker_installed():
         raise DockerError("Docker is not installed or not in PATH")
 
-    successful_tags = []
+    # Tag over one API connection when the Docker SDK is available
+    client = _docker_client()
+    if client is not None:
+        return _tag_with_client(client, source_image, target_tags)
 
-    for tag in target_tags:
+    def tag_image(tag: str) -> bool:
         try:
             subprocess.run(
                 ["docker", "tag", source_image, tag],
                 check=True
             )
-            successful_tags.append(tag)
+            return True
         except subprocess.CalledProcessError as e:
-            print(f"Error tagging {source_image} as {tag}: {e}")
+            logger.error("Error tagging %s as %s: %s", source_image, tag, e)
+            return False
+
+    return _run_concurrently(tag_image, target_tags)
+
+
+def _tag_with_client(client, source_image: str, target_tags: List[str]) -> List[str]:
+    """
+    Tag an image through a Docker SDK client
+
+    Args:
+        client: Docker SDK client
+        source_image: Source image name with tag
+        target_tags: List of target tags
+
+    Returns:
+        List[str]: List of successfully tagged images
+    """
+    from docker.errors import DockerException
+
+    try:
+        image = client.images.get(source_image)
+    except DockerException as e:
+        logger.error("Error tagging %s: %s", source_image, e)
+        return []
+
+    successful_tags = []
+
+    for tag in target_tags:
+        repository, tag_name = _split_image_tag(tag)
+        try:
+            image.tag(repository, tag_name)
+            successful_tags.append(tag)
+        except DockerException as e:
+            logger.error("Error tagging %s as %s: %s", source_image, tag, e)
 
     return successful_tags
 
 
-def push_docker_image(tags: List[str]) -> List[str]:
+def build_and_push_docker_image(
+    tags: List[str],
+    dockerfile_path: str = "Dockerfile",
+    context_path: str = ".",
+    build_args: Optional[dict] = None,
+    cache: bool = True,
+    platform: Optional[Union[str, List[str]]] = None,
+    cache_from: Optional[Union[str, List[str]]] = None,
+    cache_to: Optional[str] = None,
+) -> List[str]:
+    """
+    Build, tag and push a Docker image in a single buildx invocation
+
+    All tags are applied and pushed by one BuildKit session, and layers are
+    uploaded concurrently by buildx, overlapping with the remaining build
+    steps. When caching is enabled, cache metadata is exported inline with the
+    image (or to cache_to) so later builds can reuse it. With
+    several platforms, BuildKit builds them concurrently and pushes a single
+    multi-arch manifest list.
+
+    Args:
+        tags: Image tags to build and push (at least one)
+        dockerfile_path: Path to the Dockerfile
+        context_path: Path to the build context
+        build_args: Dictionary of build arguments (optional)
+        cache: Whether to use the build cache
+        platform: Target platform(s), as a list or comma-separated string
+            (e.g., linux/amd64,linux/arm64)
+        cache_from: Image reference(s) to import build cache from (optional)
+        cache_to: Registry image reference to export the full build cache
+            to, instead of inline cache metadata (optional)
+
+    Returns:
+        List[str]: The pushed tags
+
+    Raises:
+        DockerError: If buildx is unavailable or the build or push fails
+    """
+    if not check_docker_installed():
+        raise DockerError("Docker is not installed or not in PATH")
+
+    if not check_buildx_installed():
+        raise DockerError("Docker buildx is not installed")
+
+    _check_dockerfile(dockerfile_path)
+
+    cmd = ["docker", "buildx", "build", "--push", "--progress=plain",
+           "-f", dockerfile_path]
+
+    cmd.extend(_tag_flags(tags))
+
+    cmd.extend(_build_arg_flags(build_args))
+
+    platforms = _platform_list(platform)
+    if platforms:
+        cmd.extend(["--platform", ",".join(platforms)])
+
+    if cache:
+        if cache_to:
+            cmd.extend(["--cache-to", f"type=registry,ref={cache_to},mode=max"])
+        else:
+            cmd.extend(["--cache-to", "type=inline"])
+        if isinstance(cache_from, str):
+            cache_from = [cache_from]
+        for ref in cache_from or []:
+            cmd.extend(["--cache-from", f"type=registry,ref={ref}"])
+    else:
+        cmd.append("--no-cache")
+
+    cmd.append(context_path)
+
+    returncode, output_tail = _stream_command(
+        cmd, env={**os.environ, "DOCKER_BUILDKIT": "1"})
+    if returncode != 0:
+        raise DockerError(
+            f"Docker buildx build failed with exit code {returncode}:\n{output_tail}")
+    return list(tags)
+
+
+def push_docker_image(tags: Iterable[str], max_workers: Optional[int] = None) -> List[str]:
     """
     Push Docker images to a registry
 
+    Pushes run concurrently, so their progress output is discarded; the
+    error output of a failed push is logged.
+
     Args:
-        tags: List of image tags to push
+        tags: Image tags to push; pushes start as tags are produced, so a
+            generator such as iter_docker_tags() works
+        max_workers: Maximum concurrent pushes (optional, defaults to
+            MAX_PUSH_WORKERS or DEVKIT_PUSH_PARALLELISM)
 
     Returns:
         List[str]: List of successfully pushed images
@@ -175,19 +823,166 @@ def push_docker_image(tags: List[str]) -> List[str]:
     if not check_docker_installed():
         raise DockerError("Docker is not installed or not in PATH")
 
-    successful_pushes = []
+    # Push over the Docker API when the SDK is available
+    if _docker_client() is not None:
+        return _push_with_clients(_unique(tags), max_workers)
 
-    for tag in tags:
+    def push_tag(tag: str) -> bool:
         try:
             subprocess.run(
                 ["docker", "push", tag],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 check=True
             )
-            successful_pushes.append(tag)
+            return True
         except subprocess.CalledProcessError as e:
-            print(f"Error pushing {tag}: {e}")
+            logger.error("Error pushing %s: %s", tag,
+                         e.stderr.decode(errors="replace").strip() if e.stderr else e)
+            return False
+
+    # Pushes are network-bound and independent, so run them concurrently
+    return _run_concurrently(push_tag, _unique(tags), max_workers)
+
+
+def _push_with_clients(tags: Iterable[str], max_workers: Optional[int] = None) -> List[str]:
+    """
+    Push images concurrently through the Docker SDK
+
+    A client's requests session isn't thread-safe, so each worker thread
+    creates its own client and reuses it for every tag it pushes.
+
+    Args:
+        tags: Image tags to push
+        max_workers: Maximum concurrent pushes (optional)
+
+    Returns:
+        List[str]: List of successfully pushed images
+    """
+    local = threading.local()
+    clients = []
+
+    def push_tag(tag: str) -> bool:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = _new_docker_client()
+            if client is None:
+                logger.error("Error pushing %s: Docker daemon is unavailable", tag)
+                return False
+            clients.append(client)
+        return _push_with_client(client, tag)
+
+    try:
+        return _run_concurrently(push_tag, tags, max_workers)
+    finally:
+        for client in clients:
+            client.close()
+
+
+def _push_with_client(client, tag: str) -> bool:
+    """
+    Push an image through a Docker SDK client
+
+    Args:
+        client: Docker SDK client
+        tag: Image tag to push
+
+    Returns:
+        bool: True if the push succeeded
+    """
+    from docker.errors import DockerException
+    from requests import RequestException
+
+    repository, tag_name = _split_image_tag(tag)
+    try:
+        # Errors are reported inside the progress stream, not raised
+        for event in client.api.push(repository, tag=tag_name, stream=True, decode=True):
+            if "error" in event:
+                logger.error("Error pushing %s: %s", tag, event["error"])
+                return False
+        return True
+    # A connection dropped mid-stream surfaces as a requests error
+    except (DockerException, RequestException) as e:
+        logger.error("Error pushing %s: %s", tag, e)
+        return False
+
+
+def push_image_with_tags(
+    image: str, tags: List[str], output: Optional[TextIO] = None
+) -> List[str]:
+    """
+    Push an image and publish additional tags for it
+
+    The image is pushed once, then every extra tag in the same repository
+    is created registry-side by a single 'docker buildx imagetools create'
+    call, instead of one 'docker push' per tag. Tags for other repositories,
+    or all tags when buildx is unavailable or that call fails, are pushed
+    individually.
+
+    Args:
+        image: Image to push (name with tag)
+        tags: Additional tags for the same image
+        output: Stream for the imagetools output (optional, defaults to stdout)
+
+    Returns:
+        List[str]: List of successfully published images
+
+    Raises:
+        DockerError: If Docker push operation fails
+    """
+    # Every manifest write is a registry round-trip, so skip repeats
+    tags = [tag for tag in dict.fromkeys(tags) if tag != image]
+
+    repository = _split_image_tag(image)[0]
+    same_repo = [tag for tag in tags if _split_image_tag(tag)[0] == repository]
+
+    if not same_repo or not check_buildx_installed():
+        return push_docker_image([image, *tags])
+
+    if not push_docker_image([image]):
+        return []
+
+    try:
+        subprocess.run(
+            ["docker", "buildx", "imagetools", "create", *_tag_flags(same_repo), image],
+            stdout=output,
+            check=True
+        )
+        published = set(same_repo)
+    except subprocess.CalledProcessError as e:
+        logger.error("Error tagging %s in the registry, pushing tags instead: %s", image, e)
+        published = set()
+
+    published.update(push_docker_image(
+        [tag for tag in tags if tag not in published]))
+    return [image, *(tag for tag in tags if tag in published)]
+
+
+@functools.lru_cache(maxsize=256)
+def _version_tags(base_name: str, version: str, include_latest: bool) -> Tuple[str, ...]:
+    """
+    Get the version-derived tags for an image
+
+    These depend only on the arguments, so they are cached.
+
+    Args:
+        base_name: Base name for the Docker image
+        version: Semantic version (e.g., "1.2.3")
+        include_latest: Whether to include 'latest' tag
 
-    return successful_pushes
+    Returns:
+        Tuple[str, ...]: Full, minor, major and optionally latest tags
+    """
+    # Split version into components, treating a missing minor as 0
+    major, minor = (version.split('.', 2) + ['0'])[:2]
+    prefix = f"{base_name}:"
+
+    return (
+        prefix + version,  # Full version: org/name:1.2.3
+        f"{prefix}{major}.{minor}",  # Minor version: org/name:1.2
+        prefix + major,  # Major version: org/name:1
+        *((prefix + "latest",) if include_latest else ()),
+    )
 
 
 def generate_docker_tags(
@@ -206,42 +1001,56 @@ def generate_docker_tags(
         chainguard_tags: Whether to include Chainguard-specific tags
 
     Returns:
-        List[str]: List of tags
+        List[str]: List of unique tags, full version tag first
+    """
+    return list(iter_docker_tags(base_name, version, include_latest, chainguard_tags))
+
+
+def iter_docker_tags(
+    base_name: str,
+    version: str,
+    include_latest: bool = True,
+    chainguard_tags: bool = False,
+) -> Iterator[str]:
     """
-    # Split version into components
-    version_parts = version.split('.')
+    Yield Docker tags lazily; see generate_docker_tags
 
-    # Generate tags
-    tags = [
-        f"{base_name}:{version}",  # Full version: org/name:1.2.3
-        # Minor version: org/name:1.2
-        f"{base_name}:{version_parts[0]}.{version_parts[1]}"
-    ]
+    Args:
+        base_name: Base name for the Docker image
+        version: Semantic version (e.g., "1.2.3")
+        include_latest: Whether to include 'latest' tag
+        chainguard_tags: Whether to include Chainguard-specific tags
 
-    # Add major version tag
-    tags.append(f"{base_name}:{version_parts[0]}")  # Major version: org/name:1
+    Yields:
+        str: Unique tags, full version tag first
+    """
+    seen = set()
 
-    # Add latest tag if requested
-    if include_latest:
-        tags.append(f"{base_name}:latest")
+    def unique(tag: str) -> bool:
+        if tag in seen:
+            return False
+        seen.add(tag)
+        return True
 
-    # Add Chainguard-specific tags if requested
+    yield from filter(unique, _version_tags(base_name, version, include_latest))
+
+    # Add Chainguard-specific tags if requested. These depend on the date
+    # and the checked-out commit, so they are not part of the cached
+    # version tags.
     if chainguard_tags:
-        date_str = time.strftime("%Y%m%d")
+        prefix = f"{base_name}:"
         # Date-based tag: org/name:20230501
-        tags.append(f"{base_name}:{date_str}")
+        date_tag = prefix + time.strftime("%Y%m%d")
+        if unique(date_tag):
+            yield date_tag
         # Commit hash tag if git is available
-        try:
-            git_hash = subprocess.check_output(
-                ["git", "rev-parse", "--short", "HEAD"],
-                text=True
-            ).strip()
-            # Git hash tag: org/name:a1b2c3d
-            tags.append(f"{base_name}:{git_hash}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-
-    return tags
+        commit_hash = get_git_commit_hash()
+        if commit_hash is None:
+            return
+        # Git hash tag: org/name:a1b2c3d
+        hash_tag = prefix + commit_hash
+        if unique(hash_tag):
+            yield hash_tag
 
 
 def test_docker_image(image_name: str, test_cmd: Optional[List[str]] = None) -> Tuple[bool, str]:
@@ -258,15 +1067,19 @@ def test_docker_image(image_name: str, test_cmd: Optional[List[str]] = None) ->
     if not check_docker_installed():
         raise DockerError("Docker is not installed or not in PATH")
 
-    # Generate a unique container name
-    container_name = f"test-{int(time.time())}"
+    # Generate a unique container name; random rather than time-based so
+    # concurrent or back-to-back tests don't collide, with our PID so a
+    # leftover container can be traced to the run that started it
+    container_name = f"test-{os.getpid()}-{secrets.token_hex(4)}"
 
     # Default command if none provided
     if not test_cmd:
         test_cmd = ["echo", "Container test successful"]
 
-    # Run the container with the test command
-    cmd = ["docker", "run", "--name", container_name, "--rm", image_name]
+    # Run the container with the test command. --rm removes it once it exits,
+    # and the label lets stale test containers be pruned in one call.
+    cmd = ["docker", "run", "--name", container_name, "--rm",
+           "--label", TEST_CONTAINER_LABEL, image_name]
     if isinstance(test_cmd, str):
         cmd.append(test_cmd)
     else:
@@ -281,76 +1094,144 @@ def test_docker_image(image_name: str, test_cmd: Optional[List[str]] = None) ->
         )
         return True, result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        # Try to stop and remove container in case it's still running
-        try:
-            subprocess.run(["docker", "rm", "-f", container_name],
-                           check=False, capture_output=True)
-        except:
-            pass
         return False, f"Error testing Docker image: {e.stderr}"
 
 
-def scan_docker_image(image_name: str, output_format: str = "text") -> Tuple[bool, Union[Dict, str]]:
+@contextlib.contextmanager
+def trivy_server(timeout: float = TRIVY_SERVER_TIMEOUT) -> Iterator[str]:
+    """
+    Run a local Trivy server for the duration of a block
+
+    The server loads the vulnerability database once and keeps it in memory,
+    so passing its URL to scan_docker_image makes each scan skip that load.
+
+    Args:
+        timeout: Seconds to wait for the server to accept connections
+
+    Yields:
+        str: The server URL
+
+    Raises:
+        DockerError: If Trivy is missing or the server does not start
+    """
+    if not check_tool_installed("trivy"):
+        raise DockerError("Trivy is not installed or not in PATH")
+
+    # Reserve a free port, then hand it to the server
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    proc = subprocess.Popen(
+        ["trivy", "server", "--listen", f"127.0.0.1:{port}"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if proc.poll() is not None:
+                raise DockerError(
+                    f"Trivy server exited with code {proc.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise DockerError("Timed out waiting for the Trivy server")
+                time.sleep(0.2)
+
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def scan_docker_image(
+    image_name: str,
+    output_format: str = "text",
+    server: Optional[str] = None,
+    include_raw: bool = False,
+) -> Tuple[bool, Union[Dict, str]]:
     """
     Scan Docker image for vulnerabilities using Trivy
 
     Args:
         image_name: The Docker image name with tag
         output_format: Output format ("text" or "json")
+        server: URL of a Trivy server to scan with, e.g. from trivy_server() (optional)
+        include_raw: For JSON output, also return the full report as raw_data;
+            otherwise only the severity counts are extracted
 
     Returns:
-        Tuple[bool, Union[Dict, str]]: Success status and scan results
+        Tuple[bool, Union[Dict, str]]: Success status (no critical
+        vulnerabilities) and scan results
+
+    Raises:
+        DockerError: If Docker or Trivy is not installed
+        ScanError: If Trivy fails to scan the image
     """
     if not check_docker_installed():
         raise DockerError("Docker is not installed or not in PATH")
 
-    try:
-        # Check if Trivy is installed
-        subprocess.run(["trivy", "--version"],
-                       capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if not check_tool_installed("trivy"):
         raise DockerError("Trivy is not installed or not in PATH")
 
-    try:
-        # Run Trivy scan
-        fmt = "json" if output_format == "json" else "table"
-        result = subprocess.run(
-            ["trivy", "image", "--format", fmt, image_name],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        # Parse results based on format
-        if output_format == "json":
-            # Parse JSON output
-            scan_data = json.loads(result.stdout)
+    trivy_cmd = ["trivy", "image"]
+    if server:
+        trivy_cmd.extend(["--server", server])
 
-            # Extract vulnerability counts
-            vuln_counts = {"CRITICAL": 0, "HIGH": 0,
-                           "MEDIUM": 0, "LOW": 0, "UNKNOWN": 0}
-
-            for results in scan_data.get("Results", []):
-                for vuln in results.get("Vulnerabilities", []):
-                    severity = vuln.get("Severity", "UNKNOWN")
-                    if severity in vuln_counts:
-                        vuln_counts[severity] += 1
+    try:
+        as_json = output_format == "json"
+        if as_json:
+            # Parse the report straight from Trivy's pipe; unless the raw
+            # report is wanted, only the severities are extracted
+            json_cmd = [*trivy_cmd, "--format", "json", image_name]
+            if include_raw:
+                scan_data = _read_json_output(json_cmd)
+                vuln_counts = _tally_severities(_report_severities(scan_data))
+            else:
+                vuln_counts = _read_json_output(json_cmd, parse=_count_severities)
 
             # Determine success (no critical vulnerabilities)
-            return vuln_counts["CRITICAL"] == 0, {
-                "vulnerability_counts": vuln_counts,
-                "raw_data": scan_data
-            }
+            report = {"vulnerability_counts": vuln_counts}
+            if include_raw:
+                report["raw_data"] = scan_data
+            return vuln_counts["CRITICAL"] == 0, report
         else:
-            # Simple parsing for text output
-            has_critical = "CRITICAL" in result.stdout
-            return not has_critical, result.stdout
+            # The table lists every severity; pass/fail comes from a second,
+            # critical-only run's exit code (the image analysis is cached by
+            # then), so the table never has to be searched
+            result = subprocess.run(
+                [*trivy_cmd, "--quiet", "--format", "table", image_name],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            check = subprocess.run(
+                [*trivy_cmd, "--quiet", "--severity", "CRITICAL",
+                 "--exit-code", str(TRIVY_FINDINGS_EXIT_CODE),
+                 "--format", "json", image_name],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            if check.returncode not in (0, TRIVY_FINDINGS_EXIT_CODE):
+                raise subprocess.CalledProcessError(
+                    check.returncode, check.args, stderr=check.stderr)
+            return check.returncode == 0, result.stdout
     except subprocess.CalledProcessError as e:
-        error_msg = f"Error scanning Docker image: {e.stderr}"
-        return False, error_msg if output_format == "text" else {"error": error_msg}
+        raise ScanError(f"Error scanning Docker image: {e.stderr}") from e
 
 
-def generate_sbom(image_name: str, output_file: Optional[str] = None, format: str = "spdx-json") -> Tuple[bool, str]:
+def generate_sbom(
+    image_name: str,
+    output_file: Optional[str] = None,
+    format: str = "spdx-json",
+    return_bytes: bool = False,
+) -> Tuple[bool, Union[str, bytes]]:
     """
     Generate Software Bill of Materials (SBOM) for a Docker image
 
@@ -358,9 +1239,12 @@ def generate_sbom(image_name: str, output_file: Optional[str] = None, format: st
         image_name: The Docker image name with tag
         output_file: Path to save the SBOM (optional)
         format: SBOM format (e.g., spdx-json, cyclonedx-json)
+        return_bytes: Without output_file, return the SBOM itself instead of
+            writing it to a temporary file
 
     Returns:
-        Tuple[bool, str]: Success status and output file path or error message
+        Tuple[bool, Union[str, bytes]]: Success status and output file path,
+        SBOM bytes (with return_bytes) or error message
     """
     # Try syft first (preferred)
     if check_tool_installed("syft"):
@@ -371,6 +1255,10 @@ def generate_sbom(image_name: str, output_file: Optional[str] = None, format: st
                 cmd.extend(["-f", output_file])
                 result = subprocess.run(cmd, check=True)
                 return True, output_file
+            elif return_bytes:
+                # syft writes the SBOM to stdout by default
+                result = subprocess.run(cmd, stdout=subprocess.PIPE, check=True)
+                return True, result.stdout
             else:
                 # Create a temporary file if no output file is specified
                 with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
@@ -391,14 +1279,15 @@ def generate_sbom(image_name: str, output_file: Optional[str] = None, format: st
                 cmd.extend(["--output", output_file])
                 result = subprocess.run(cmd, check=True)
                 return True, output_file
+            elif return_bytes:
+                result = subprocess.run(cmd, stdout=subprocess.PIPE, check=True)
+                return True, result.stdout
             else:
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, check=True)
-
-                # Create a temporary file to store the SBOM
+                # Let Docker Scout write the SBOM straight into a temporary
+                # file instead of buffering it in memory
                 with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
-                    tmp.write(result.stdout)
                     temp_path = tmp.name
+                    subprocess.run(cmd, stdout=tmp, check=True)
 
                 return True, temp_path
         except subprocess.CalledProcessError as e:
@@ -435,11 +1324,11 @@ def sign_image(image_name: str, key_path: Optional[str] = None) -> Tuple[bool, s
             # Sign with key if provided
             cmd = ["cosign", "sign", "--key", key_path, image_name]
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, check=True)
+        # Only stderr is needed, for the error message
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
         return True, "Image signed successfully"
     except subprocess.CalledProcessError as e:
-        return False, f"Error signing image: {e.stderr}"
+        return False, f"Error signing image: {e.stderr.decode(errors='replace')}"
 
 
 def verify_image_signature(image_name: str, key_path: Optional[str] = None) -> Tuple[bool, str]:
@@ -486,25 +1375,94 @@ def check_kyverno_policy(k8s_manifest: str, policy_file: str) -> Tuple[bool, Dic
     try:
         cmd = ["kyverno", "test", k8s_manifest,
                "--policy", policy_file, "--output", "json"]
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, check=True)
+        # Captured as bytes, which are parsed without a decode pass
+        result = subprocess.run(cmd, capture_output=True, check=True)
 
         try:
-            policy_results = json.loads(result.stdout)
+            policy_results = _loads_json(result.stdout)
             # Check if any policy rules failed
-            success = True
-            for policy in policy_results:
-                if policy.get("pass") is False:
-                    success = False
-                    break
+            success = not any(policy.get("pass") is False
+                              for policy in policy_results)
 
             return success, policy_results
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             # Fallback to non-JSON output handling
-            success = "PASS" in result.stdout and "FAIL" not in result.stdout
-            return success, {"output": result.stdout}
+            output = result.stdout.decode(errors="replace")
+            success = "PASS" in output and "FAIL" not in output
+            return success, {"output": output}
     except subprocess.CalledProcessError as e:
-        return False, {"error": f"Error checking policy compliance: {e.stderr}"}
+        return False, {"error": f"Error checking policy compliance: {e.stderr.decode(errors='replace')}"}
+
+
+def _icon(symbol: str) -> str:
+    """Return an emoji prefix for a pipeline message, only for interactive (INFO) output"""
+    return f"{symbol} " if logger.isEnabledFor(logging.INFO) else ""
+
+
+def _scan_stage(image: str) -> Dict:
+    """Run the secure pipeline's vulnerability scan"""
+    try:
+        logger.info("🔍 Scanning for vulnerabilities...")
+        scan_success, scan_output = scan_docker_image(image, output_format="json")
+        if scan_success:
+            logger.info("✅ Vulnerability scan passed")
+        else:
+            counts = (scan_output.get("vulnerability_counts", {})
+                      if isinstance(scan_output, dict) else {})
+            logger.warning("%sVulnerability scan found critical issues: %s",
+                           _icon("⚠️"),
+                           ", ".join(f"{severity}: {count}"
+                                     for severity, count in counts.items() if count > 0))
+        return {"success": scan_success, "output": scan_output}
+    except ScanError as e:
+        # A failed scan stops the pipeline like critical findings do
+        logger.error("%sScan failed: %s", _icon("❌"), e)
+        return {"success": False, "output": {"error": str(e)}}
+    except Exception as e:
+        logger.error("%sScan failed: %s", _icon("❌"), e)
+        return {"success": False, "output": str(e)}
+
+
+def _sbom_stage(image: str) -> Dict:
+    """Run the secure pipeline's SBOM generation"""
+    try:
+        logger.info("📄 Generating SBOM...")
+        sbom_dir = "sboms"
+        os.makedirs(sbom_dir, exist_ok=True)
+        output_file = os.path.join(
+            sbom_dir, f"{os.path.basename(image).replace(':', '-')}.sbom.json")
+        sbom_success, sbom_output = generate_sbom(image, output_file)
+        if sbom_success:
+            logger.info("✅ SBOM generated: %s", sbom_output)
+        else:
+            logger.warning("%sSBOM generation warning: %s", _icon("⚠️"), sbom_output)
+        return {"success": sbom_success, "output": sbom_output}
+    except Exception as e:
+        logger.error("%sSBOM generation failed: %s", _icon("❌"), e)
+        return {"success": False, "output": str(e)}
+
+
+def _policy_stage(k8s_manifest: str, policy_files: List[str]) -> Dict:
+    """Check a Kubernetes manifest against every policy file concurrently"""
+    try:
+        logger.info("🔒 Checking policy compliance...")
+        with ThreadPoolExecutor(max_workers=min(_max_workers(), len(policy_files))) as executor:
+            outcomes = list(executor.map(
+                lambda policy_file: check_kyverno_policy(k8s_manifest, policy_file),
+                policy_files))
+        policy_results = [
+            {"policy": policy_file, "success": success, "output": output}
+            for policy_file, (success, output) in zip(policy_files, outcomes)
+        ]
+        overall_policy_success = all(success for success, _ in outcomes)
+        if overall_policy_success:
+            logger.info("✅ Policy compliance checks passed")
+        else:
+            logger.warning("%sPolicy compliance checks failed", _icon("⚠️"))
+        return {"success": overall_policy_success, "output": policy_results}
+    except Exception as e:
+        logger.error("%sPolicy check failed: %s", _icon("❌"), e)
+        return {"success": False, "output": str(e)}
 
 
 def secure_pipeline(
@@ -516,7 +1474,8 @@ def secure_pipeline(
     policy_files: Optional[List[str]] = None,
     k8s_manifest: Optional[str] = None,
     signing_key: Optional[str] = None,
-    push: bool = False
+    push: bool = False,
+    output: Optional[TextIO] = None,
 ) -> Dict:
     """
     Run a complete secure CI/CD pipeline for Docker images
@@ -531,6 +1490,8 @@ def secure_pipeline(
         k8s_manifest: Path to Kubernetes manifest to check
         signing_key: Path to Cosign signing key
         push: Whether to push to registry
+        output: Stream for build and push tool output (optional, defaults
+            to stdout), e.g. stderr to keep stdout for machine-readable results
 
     Returns:
         Dict: Results of the pipeline
@@ -544,120 +1505,88 @@ def secure_pipeline(
         "push": {"success": False, "output": None}
     }
 
+    # Resolve the default image name once here rather than inside the
+    # build step
+    test_cmd = [
+        "--version"] if not image_name or "devkit" in image_name.lower() else None
+    image_name = image_name or default_image_name()
+
+    # Registry tags are applied by the build itself rather than by a
+    # 'docker tag' per tag afterwards
+    target_tags = generate_docker_tags(
+        registry, get_current_version()) if registry else []
+
+    # Reuse layers from the registry build cache, so fresh CI agents only
+    # rebuild the steps that changed; refresh it when we push anyway and
+    # the builder can export cache
+    cache_from = cache_to = None
+    if registry and check_buildx_installed():
+        # The cache tag is a BuildKit cache manifest, which the classic
+        # builder can't import
+        cache_ref = f"{registry}:{BUILD_CACHE_TAG}"
+        cache_from = [cache_ref]
+        if push and check_buildx_cache_export():
+            cache_to = cache_ref
+
     # 1. Build the image
     try:
-        print("🔨 Building Docker image...")
+        logger.info("🔨 Building Docker image...")
         built_image = build_docker_image(
             dockerfile_path=dockerfile_path,
             context_path=context_path,
             image_name=image_name,
-            build_args=build_args
+            build_args=build_args,
+            extra_tags=target_tags,
+            cache_from=cache_from,
+            cache_to=cache_to,
+            output=output
         )
         results["build"] = {"success": True, "output": built_image}
-        print(f"✅ Image built: {built_image}")
+        logger.info("✅ Image built: %s", built_image)
     except Exception as e:
         results["build"] = {"success": False, "output": str(e)}
-        print(f"❌ Build failed: {str(e)}")
+        logger.error("%sBuild failed: %s", _icon("❌"), e)
         return results  # Stop if build fails
 
     # 2. Test the image
-    test_cmd = [
-        "--version"] if not image_name or "devkit" in image_name.lower() else None
     try:
-        print("🧪 Testing the image...")
+        logger.info("🧪 Testing the image...")
         test_success, test_output = test_docker_image(built_image, test_cmd)
         if not test_success:
             results["test"] = {"success": False, "output": test_output}
-            print(f"❌ Test failed: {test_output}")
+            logger.error("%sTest failed: %s", _icon("❌"), test_output)
             return results  # Stop if test fails
         results["test"] = {"success": True, "output": test_output}
-        print(f"✅ Test passed: {test_output}")
+        logger.info("✅ Test passed: %s", test_output)
     except Exception as e:
         results["test"] = {"success": False, "output": str(e)}
-        print(f"❌ Test failed: {str(e)}")
+        logger.error("%sTest failed: %s", _icon("❌"), e)
         return results
 
-    # 3. Scan for vulnerabilities
-    try:
-        print("🔍 Scanning for vulnerabilities...")
-        scan_success, scan_output = scan_docker_image(
-            built_image, output_format="json")
-        results["scan"] = {"success": scan_success, "output": scan_output}
-        if not scan_success:
-            print("⚠️ Vulnerability scan found critical issues:")
-            if isinstance(scan_output, dict) and "vulnerability_counts" in scan_output:
-                for severity, count in scan_output["vulnerability_counts"].items():
-                    if count > 0:
-                        print(f"  - {severity}: {count}")
-            return results  # Stop if critical vulnerabilities found
-        print("✅ Vulnerability scan passed")
-    except Exception as e:
-        results["scan"] = {"success": False, "output": str(e)}
-        print(f"❌ Scan failed: {str(e)}")
-
-    # 4. Generate SBOM
-    try:
-        print("📄 Generating SBOM...")
-        sbom_dir = "sboms"
-        os.makedirs(sbom_dir, exist_ok=True)
-        output_file = os.path.join(
-            sbom_dir, f"{os.path.basename(built_image).replace(':', '-')}.sbom.json")
-        sbom_success, sbom_output = generate_sbom(built_image, output_file)
-        results["sbom"] = {"success": sbom_success, "output": sbom_output}
-        if sbom_success:
-            print(f"✅ SBOM generated: {sbom_output}")
-        else:
-            print(f"⚠️ SBOM generation warning: {sbom_output}")
-    except Exception as e:
-        results["sbom"] = {"success": False, "output": str(e)}
-        print(f"❌ SBOM generation failed: {str(e)}")
-
-    # 5. Check Kubernetes manifest against policies
+    # 3-5. Scan, SBOM generation and policy checks only need the built
+    # image, so run them concurrently
+    stages = {"scan": _scan_stage, "sbom": _sbom_stage}
     if policy_files and k8s_manifest:
-        try:
-            print("🔒 Checking policy compliance...")
-            policy_results = []
-            overall_policy_success = True
-
-            for policy_file in policy_files:
-                policy_success, policy_output = check_kyverno_policy(
-                    k8s_manifest, policy_file)
-                policy_results.append({
-                    "policy": policy_file,
-                    "success": policy_success,
-                    "output": policy_output
-                })
-                if not policy_success:
-                    overall_policy_success = False
-
-            results["policy"] = {
-                "success": overall_policy_success, "output": policy_results}
-            if overall_policy_success:
-                print("✅ Policy compliance checks passed")
-            else:
-                print("⚠️ Policy compliance checks failed")
-        except Exception as e:
-            results["policy"] = {"success": False, "output": str(e)}
-            print(f"❌ Policy check failed: {str(e)}")
+        stages["policy"] = lambda image: _policy_stage(k8s_manifest, policy_files)
+    with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+        futures = {name: executor.submit(stage, built_image)
+                   for name, stage in stages.items()}
+        for name, future in futures.items():
+            results[name] = future.result()
+
+    # Stop if the scan found critical issues (a scan that raised is only
+    # reported, as before)
+    if not results["scan"]["success"] and isinstance(results["scan"]["output"], dict):
+        return results
 
-    # 6. Tag the image for registry if needed
+    # 6. The registry tags were applied by the build
     if registry:
-        version = get_current_version()
-        target_tags = generate_docker_tags(registry, version)
-        try:
-            print("🏷️ Tagging images...")
-            tagged_images = tag_docker_image(built_image, target_tags)
-            results["tag"] = {"success": len(
-                tagged_images) > 0, "output": tagged_images}
-            print(f"✅ Tagged {len(tagged_images)} images")
-        except Exception as e:
-            results["tag"] = {"success": False, "output": str(e)}
-            print(f"❌ Tagging failed: {str(e)}")
-            return results
+        results["tag"] = {"success": True, "output": target_tags}
+        logger.info("✅ Tagged %s images", len(target_tags))
 
         # 7. Sign the image
         try:
-            print("🔏 Signing image...")
+            logger.info("🔏 Signing image...")
             if registry:
                 # Sign the full version tag
                 sign_success, sign_output = sign_image(
@@ -665,24 +1594,25 @@ def secure_pipeline(
                 results["sign"] = {
                     "success": sign_success, "output": sign_output}
                 if sign_success:
-                    print("✅ Image signed successfully")
+                    logger.info("✅ Image signed successfully")
                 else:
-                    print(f"⚠️ Image signing warning: {sign_output}")
+                    logger.warning("%sImage signing warning: %s", _icon("⚠️"), sign_output)
         except Exception as e:
             results["sign"] = {"success": False, "output": str(e)}
-            print(f"❌ Image signing failed: {str(e)}")
+            logger.error("%sImage signing failed: %s", _icon("❌"), e)
 
         # 8. Push to registry if requested
         if push:
             try:
-                print("🚀 Pushing to registry...")
-                pushed_images = push_docker_image(target_tags)
+                logger.info("🚀 Pushing to registry...")
+                pushed_images = push_image_with_tags(
+                    target_tags[0], target_tags[1:], output=output)
                 results["push"] = {"success": len(
                     pushed_images) > 0, "output": pushed_images}
-                print(f"✅ Pushed {len(pushed_images)} images to registry")
+                logger.info("✅ Pushed %s images to registry", len(pushed_images))
             except Exception as e:
                 results["push"] = {"success": False, "output": str(e)}
-                print(f"❌ Push failed: {str(e)}")
+                logger.error("%sPush failed: %s", _icon("❌"), e)
 
-    print("✅ Secure pipeline completed!")
+    logger.info("✅ Secure pipeline completed!")
     return results
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""
+asyncio variants of the devkit.docker operations
+
+These run docker through asyncio subprocesses, so many builds, tags and
+pushes can be driven concurrently from one event loop with asyncio.gather
+instead of a thread per operation. Output is captured rather than streamed,
+since concurrent operations would otherwise interleave their logs.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+
+from devkit.docker import (
+    DockerError,
+    _build_command,
+    _max_workers,
+    _pull_missing_images,
+    check_docker_installed,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _run(cmd: List[str], env: Optional[Dict[str, str]] = None) -> Tuple[int, str, str]:
+    """
+    Run a command without blocking the event loop
+
+    Args:
+        cmd: Command to run
+        env: Environment for the command (optional, defaults to ours)
+
+    Returns:
+        Tuple[int, str, str]: Exit code, stdout and stderr
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE, env=env)
+    except OSError as e:
+        return 127, "", str(e)
+
+    try:
+        stdout, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    return (proc.returncode, stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"))
+
+
+async def abuild_docker_image(
+    dockerfile_path: str = "Dockerfile",
+    context_path: str = ".",
+    image_name: Optional[str] = None,
+    build_args: Optional[dict] = None,
+    cache: bool = True,
+    platform: Optional[Union[str, List[str]]] = None,
+    extra_tags: Optional[List[str]] = None,
+    cache_from: Optional[List[str]] = None,
+    cache_to: Optional[str] = None,
+    buildkit: bool = True,
+) -> str:
+    """
+    Build a Docker image; see devkit.docker.build_docker_image
+
+    Returns:
+        str: The built image name with tag
+
+    Raises:
+        DockerError: If Docker build fails
+    """
+    cmd, image_name, env = _build_command(
+        dockerfile_path, context_path, image_name, build_args, cache,
+        platform, extra_tags, cache_from, cache_to, buildkit)
+
+    # The classic builder only uses cache images that are present locally;
+    # pulling blocks, so run it off the event loop
+    if cache and cache_from and env["DOCKER_BUILDKIT"] == "0":
+        await asyncio.get_running_loop().run_in_executor(
+            None, _pull_missing_images, cache_from)
+
+    returncode, _, stderr = await _run(cmd, env=env)
+    if returncode != 0:
+        raise DockerError(
+            f"Docker build failed with exit code {returncode}:\n{stderr}")
+    return image_name
+
+
+async def _run_each(cmds: Dict[str, List[str]], action: str) -> List[str]:
+    """
+    Run one command per item concurrently, bounded like the thread pools
+
+    Args:
+        cmds: Commands keyed by the item they act on
+        action: Description of the action for error messages
+
+    Returns:
+        List[str]: Items whose command succeeded, in input order
+    """
+    limit = asyncio.Semaphore(_max_workers())
+
+    async def run_one(cmd: List[str]) -> bool:
+        async with limit:
+            returncode, _, stderr = await _run(cmd)
+        if returncode != 0:
+            logger.error("Error %s %s: %s", action, cmd[-1], stderr.strip())
+        return returncode == 0
+
+    results = await asyncio.gather(*(run_one(cmd) for cmd in cmds.values()))
+    return [item for item, ok in zip(cmds, results) if ok]
+
+
+async def atag_docker_image(source_image: str, target_tags: List[str]) -> List[str]:
+    """
+    Tag a Docker image with multiple tags; see devkit.docker.tag_docker_image
+
+    Returns:
+        List[str]: List of successfully tagged images
+
+    Raises:
+        DockerError: If Docker is not available
+    """
+    if not check_docker_installed():
+        raise DockerError("Docker is not installed or not in PATH")
+
+    return await _run_each(
+        {tag: ["docker", "tag", source_image, tag] for tag in target_tags},
+        f"tagging {source_image} as")
+
+
+async def apush_docker_image(tags: List[str]) -> List[str]:
+    """
+    Push Docker images to a registry; see devkit.docker.push_docker_image
+
+    Returns:
+        List[str]: List of successfully pushed images
+
+    Raises:
+        DockerError: If Docker is not available
+    """
+    if not check_docker_installed():
+        raise DockerError("Docker is not installed or not in PATH")
+
+    return await _run_each(
+        {tag: ["docker", "push", tag] for tag in tags}, "pushing")
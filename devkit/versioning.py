@@ -1,10 +1,19 @@
 #!/usr/bin/env python3
 
+import functools
+import os
 import re
+import shutil
 import subprocess
 from enum import Enum
 from typing import Optional, Tuple
 
+_SEMVER_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)')
+_VERSION_ASSIGN_RE = re.compile(r'__version__\s*=\s*"([^"]+)"')
+_SETUP_VERSION_RE = re.compile(r'version="[^"]+"')
+_VTAG_RE = re.compile(r'v(\d+\.\d+\.\d+)')
+_VERSION_FILE = "devkit/__init__.py"
+
 
 class VersionBump(Enum):
     """Version bump types following semantic versioning"""
@@ -13,13 +22,27 @@ class VersionBump(Enum):
     PATCH = "patch"
 
 
+@functools.lru_cache(maxsize=1)
 def get_current_version() -> str:
     """
     Get the current version from __init__.py
 
+    The file is read rather than imported so that a version bump is seen
+    in the same process. The result is cached; update_version_in_files()
+    clears the cache.
+
     Returns:
         str: The current version
     """
+    try:
+        with open(_VERSION_FILE, "r") as f:
+            match = _VERSION_ASSIGN_RE.search(f.read())
+        if match:
+            return match.group(1)
+    except OSError:
+        pass
+
+    # Outside a devkit checkout, fall back to the installed package
     try:
         from devkit import __version__
         return __version__
@@ -37,7 +60,7 @@ def parse_semantic_version(version: str) -> Tuple[int, int, int]:
     Returns:
         Tuple: (major, minor, patch) version numbers
     """
-    match = re.match(r'^(\d+)\.(\d+)\.(\d+)$', version)
+    match = _SEMVER_RE.fullmatch(version)
     if not match:
         raise ValueError(f"Invalid semantic version format: {version}")
 
@@ -67,43 +90,69 @@ def bump_version(current_version: str, bump_type: VersionBump) -> str:
     raise ValueError(f"Invalid bump type: {bump_type}")
 
 
-def update_version_in_files(new_version: str) -> bool:
+def _render_version_update(path: str, pattern: re.Pattern, replacement: str) -> Tuple[str, Optional[str]]:
     """
-    Update version in all relevant files
+    Render a file with its version string replaced
 
     Args:
-        new_version: New version to set
+        path: File to update
+        pattern: Pattern matching the version string
+        replacement: Replacement for the first match
 
     Returns:
-        bool: Success status
+        Tuple: (path, new content), with None as content if nothing changed
     """
-    # Update in __init__.py
-    try:
-        with open("devkit/__init__.py", "r") as f:
-            content = f.read()
+    with open(path, "r") as f:
+        content = f.read()
+    new_content = pattern.sub(replacement, content, count=1)
+    return path, new_content if new_content != content else None
 
-        new_content = re.sub(
-            r'__version__\s*=\s*"[^"]+"',
-            f'__version__ = "{new_version}"',
-            content
-        )
 
-        with open("devkit/__init__.py", "w") as f:
-            f.write(new_content)
+def _replace_file(path: str, content: str) -> None:
+    """
+    Atomically replace a file's content
+
+    Args:
+        path: File to replace
+        content: New content
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-        # Update in setup.py
-        with open("setup.py", "r") as f:
-            content = f.read()
 
-        new_content = re.sub(
-            r'version="[^"]+"',
-            f'version="{new_version}"',
-            content
-        )
+def update_version_in_files(new_version: str) -> bool:
+    """
+    Update version in all relevant files
 
-        with open("setup.py", "w") as f:
-            f.write(new_content)
+    Args:
+        new_version: New version to set
 
+    Returns:
+        bool: Success status
+    """
+    # Both files are rendered before either is written, and each is
+    # replaced atomically, so a failure can't leave a half-written file
+    try:
+        updates = [
+            _render_version_update(
+                _VERSION_FILE, _VERSION_ASSIGN_RE,
+                f'__version__ = "{new_version}"'),
+            _render_version_update(
+                "setup.py", _SETUP_VERSION_RE, f'version="{new_version}"'),
+        ]
+        for path, content in updates:
+            if content is not None:
+                _replace_file(path, content)
+
+        get_current_version.cache_clear()
         return True
     except Exception as e:
         print(f"Error updating version in files: {e}")
@@ -131,6 +180,7 @@ def create_git_tag(version: str, message: Optional[str] = None) -> bool:
             subprocess.run(["git", "tag", "-a", tag, "-m",
                            default_message], check=True)
 
+        get_latest_git_tag.cache_clear()
         return True
     except subprocess.CalledProcessError as e:
         print(f"Error creating git tag: {e}")
@@ -156,16 +206,20 @@ def push_git_tag(version: str) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_latest_git_tag() -> Optional[str]:
     """
     Get the latest git tag (semver only)
 
+    The result is cached; create_git_tag() clears the cache.
+
     Returns:
         str or None: Latest git tag without 'v' prefix, or None if no tags
     """
     try:
+        # Let git drop tags that can't be versions before sorting
         result = subprocess.run(
-            ["git", "tag", "--sort=-v:refname"],
+            ["git", "tag", "--list", "v[0-9]*.[0-9]*.[0-9]*", "--sort=-v:refname"],
             capture_output=True,
             text=True,
             check=True
@@ -174,15 +228,35 @@ def get_latest_git_tag() -> Optional[str]:
         tags = result.stdout.strip().split('\n')
         for tag in tags:
             # Match only semantic versioning tags
-            if re.match(r'^v\d+\.\d+\.\d+$', tag):
-                # Remove 'v' prefix
-                return tag[1:]
+            match = _VTAG_RE.fullmatch(tag)
+            if match:
+                # Version without the 'v' prefix
+                return match.group(1)
 
         return None
     except subprocess.CalledProcessError:
         return None
 
 
+@functools.lru_cache(maxsize=1)
+def get_git_commit_hash() -> Optional[str]:
+    """
+    Get the short hash of the current commit
+
+    The result is cached; commit_version_change() clears the cache.
+
+    Returns:
+        str or None: Short commit hash, or None if git is unavailable
+    """
+    try:
+        short_hash = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True, stderr=subprocess.DEVNULL).strip()
+    except (subprocess.SubprocessError, OSError):
+        return None
+    return short_hash or None
+
+
 def commit_version_change(version: str, bump_type: VersionBump) -> bool:
     """
     Commit version changes with proper conventional commit message
@@ -207,6 +281,7 @@ def commit_version_change(version: str, bump_type: VersionBump) -> bool:
             message = f"chore(release): bump minor version to {version}"
 
         subprocess.run(["git", "commit", "-m", message], check=True)
+        get_git_commit_hash.cache_clear()
         return True
     except subprocess.CalledProcessError as e:
         print(f"Error committing version change: {e}")
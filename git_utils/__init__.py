@@ -0,0 +1,3 @@
+from .commit import CommitManager
+from .hooks import HookManager
+from .utils import GitUtils
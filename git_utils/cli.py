@@ -1,12 +1,15 @@
 import click
+from git import Repo
 from git_utils import CommitManager, HookManager, GitUtils
 
 class GitUtilsCLI:
     def __init__(self, repo_path='.'):
         self.repo_path = repo_path
-        self.commit_mgr = CommitManager(repo_path)
-        self.hook_mgr = HookManager(repo_path)
-        self.git_utils = GitUtils(repo_path)
+        # Open the repository once and share it between the managers
+        self.repo = Repo(repo_path)
+        self.commit_mgr = CommitManager(repo_path, repo=self.repo)
+        self.hook_mgr = HookManager(repo_path, repo=self.repo)
+        self.git_utils = GitUtils(repo_path, repo=self.repo)
 
 @click.group()
 def cli():
@@ -15,10 +18,11 @@ def cli():
 @cli.command()
 @click.argument('message')
 @click.option('--files', '-f', multiple=True, help='Specific files to commit')
-def commit(message, files):
+@click.pass_context
+def commit(ctx, message, files):
     """Create a new commit"""
     try:
-        cli = GitUtilsCLI()
+        cli = ctx.ensure_object(GitUtilsCLI)
         cli.commit_mgr.create_commit(message, files)
         click.echo(f"Successfully created commit: {message}")
     except Exception as e:
@@ -27,28 +31,34 @@ def commit(message, files):
 @cli.command()
 @click.argument('hook_name')
 @click.argument('hook_content', type=click.File('r'))
-def install_hook(hook_name, hook_content):
+@click.pass_context
+def install_hook(ctx, hook_name, hook_content):
     """Install a git hook"""
     try:
-        cli = GitUtilsCLI()
+        cli = ctx.ensure_object(GitUtilsCLI)
         cli.hook_mgr.install_hook(hook_name, hook_content.read())
         click.echo(f"Successfully installed {hook_name} hook")
     except Exception as e:
         click.echo(f"Error installing hook: {str(e)}", err=True)
 
 @cli.command()
-def status():
+@click.option('--no-untracked', is_flag=True, help='Skip looking for untracked files (faster in large repositories)')
+@click.pass_context
+def status(ctx, no_untracked):
     """Get repository status"""
     try:
-        cli = GitUtilsCLI()
-        click.echo(f"Current Branch: {cli.git_utils.get_current_branch()}")
-        if cli.git_utils.is_clean_working_directory():
-            click.echo("Working directory is clean")
+        cli = ctx.ensure_object(GitUtilsCLI)
+        # One status read covers the branch, changes and untracked files
+        repo_status = cli.git_utils.get_status(include_untracked=not no_untracked)
+        click.echo(f"Current Branch: {repo_status['branch']}")
+        if repo_status['is_clean']:
+            click.echo("No changes to tracked files" if no_untracked else "Working directory is clean")
         else:
             click.echo("Working directory has changes")
-            click.echo("Untracked files:")
-            for file in cli.git_utils.get_untracked_files():
-                click.echo(f"  {file}")
+            if not no_untracked:
+                click.echo("Untracked files:")
+                for file in repo_status['untracked_files']:
+                    click.echo(f"  {file}")
     except Exception as e:
         click.echo(f"Error getting status: {str(e)}", err=True)
 
@@ -1,19 +1,23 @@
 from git import Repo
-from typing import Optional, List
+from git.exc import BadName
+from datetime import datetime
+from typing import Dict, Iterator, Optional, List, Tuple
 from .commit_validator import CommitValidator
-from .logger import GitLogger
+from .logger import get_logger
 
 class CommitManager:
-    def __init__(self, repo_path: str = '.', config: Optional[dict] = None):
+    def __init__(self, repo_path: str = '.', config: Optional[dict] = None,
+                 repo: Optional[Repo] = None):
         """Initialize commit manager
         
         Args:
             repo_path: Path to git repository
             config: Configuration dictionary
+            repo: Already opened repository to use instead of opening repo_path
         """
-        self.repo = Repo(repo_path)
+        self.repo = repo or Repo(repo_path)
         self.validator = CommitValidator(config)
-        self.logger = GitLogger(config).get_logger()
+        self.logger = get_logger(config)
         
     def validate_message(self, message: str) -> bool:
         """Validate commit message
@@ -24,12 +28,10 @@ class CommitManager:
         Returns:
             bool: True if message is valid, False otherwise
         """
-        if not self.validator.validate_message(message):
-            errors = self.validator.get_validation_errors(message)
-            for error in errors:
-                self.logger.error(error)
-            return False
-        return True
+        is_valid, errors = self.validator.check(message)
+        for error in errors:
+            self.logger.error(error)
+        return is_valid
         
     def create_commit(self, message: str, files: Optional[List[str]] = None) -> None:
         """Create a new commit
@@ -46,7 +48,9 @@ class CommitManager:
                 raise ValueError("Invalid commit message")
                 
             if files:
-                self.repo.git.add(files)
+                # Stage with git itself so .gitignore and clean filters
+                # (LFS, eol conversion) apply
+                self.repo.git.add('--', *files)
             else:
                 self.repo.git.add('.')
                 
@@ -66,15 +70,88 @@ class CommitManager:
         Returns:
             List of commit information dictionaries
         """
-        commits = []
-        for commit in self.repo.iter_commits(max_count=limit):
-            commits.append({
-                'sha': commit.hexsha,
-                'message': commit.message,
-                'author': commit.author.name,
-                'date': commit.committed_datetime
-            })
-        return commits
+        return list(self.iter_commit_history(limit))
+        
+    def get_commit_history_columns(self, limit: int = 10) -> Dict[str, list]:
+        """Get recent commit history as parallel lists
+        
+        Suited to analysis, e.g. pandas.DataFrame(columns), without a dict
+        per commit.
+        
+        Args:
+            limit: Maximum number of commits to return
+            
+        Returns:
+            Dict[str, list]: Lists of sha, message, author and date values,
+            one entry per commit
+        """
+        columns = {'sha': [], 'message': [], 'author': [], 'date': []}
+        shas, messages, authors, dates = columns.values()
+        for sha, message, author, date in self._iter_commit_fields(limit):
+            shas.append(sha)
+            messages.append(message)
+            authors.append(author)
+            dates.append(date)
+        return columns
+        
+    def iter_commit_history(self, limit: int = 10) -> Iterator[dict]:
+        """Yield recent commits as they are read from a single git log
+        
+        Args:
+            limit: Maximum number of commits to yield
+            
+        Yields:
+            dict: Commit information with sha, message, author and date
+        """
+        for sha, message, author, date in self._iter_commit_fields(limit):
+            yield {
+                'sha': sha,
+                'message': message,
+                'author': author,
+                'date': date
+            }
+            
+    def _iter_commit_fields(self, limit: int) -> Iterator[Tuple[str, str, str, datetime]]:
+        """Yield (sha, message, author, date) for recent commits from one git log"""
+        # Each commit is four NUL-terminated fields, so messages can hold
+        # any text
+        proc = self.repo.git.log(f'--max-count={limit}', '-z',
+                                 '--format=%H%x00%an%x00%cI%x00%B', as_process=True)
+        fields = []
+        for field in _iter_nul_terminated(proc.stdout):
+            fields.append(field.decode('utf-8', 'replace'))
+            if len(fields) == 4:
+                sha, author, date, message = fields
+                fields = []
+                yield sha, message, author, datetime.fromisoformat(date)
+        proc.wait()
+        
+    def get_commit(self, commit: str) -> dict:
+        """Get information about a single commit
+        
+        Commit objects are read through GitPython's long-lived
+        'git cat-file --batch' process, so looking up many commits doesn't
+        start a git process per commit.
+        
+        Args:
+            commit: Commit hash (full or abbreviated) or revision
+            
+        Returns:
+            dict: Commit information with sha, message, author and date
+            
+        Raises:
+            ValueError: If commit does not name a commit
+        """
+        try:
+            obj = self.repo.commit(commit)
+        except (BadName, ValueError) as e:
+            raise ValueError(f"Invalid commit: {commit}") from e
+        return {
+            'sha': obj.hexsha,
+            'message': obj.message,
+            'author': obj.author.name,
+            'date': obj.committed_datetime
+        }
         
     def revert_commit(self, commit: str) -> None:
         """Revert a specific commit
@@ -86,8 +163,17 @@ class CommitManager:
             ValueError: If commit hash is invalid
         """
         try:
+            self.get_commit(commit)
             self.repo.git.revert(commit)
             self.logger.info(f"Successfully reverted commit: {commit}")
         except Exception as e:
             self.logger.error(f"Error reverting commit: {str(e)}")
             raise
+
+
+def _iter_nul_terminated(stream, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield the NUL-terminated fields of a binary stream as they arrive"""
+    pending = b''
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        *fields, pending = (pending + chunk).split(b'\0')
+        yield from fields
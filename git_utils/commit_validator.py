@@ -1,7 +1,10 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import re
 from .config import ConfigManager
 
+_CONVENTIONAL_RE = re.compile(r'^(feat|fix|docs|style|refactor|test|chore)(?:\([^)]+\))?: .+$')
+_SEMANTIC_RE = re.compile(r'^(build|ci|docs|feat|fix|perf|refactor|style|test|chore)(?:\([^)]+\))?: .+$')
+
 class CommitValidator:
     """Validate commit messages against configured rules"""
     
@@ -13,6 +16,9 @@ class CommitValidator:
         """
         self.config_manager = ConfigManager()
         self.config = config or self.config_manager.get_config()
+        self._rules = self.config['commit']['rules']
+        self._max_len = self._rules['max_length']
+        self._formats = self.config['commit']['formats']
         
     def validate_message(self, message: str) -> bool:
         """Validate commit message against all rules
@@ -23,24 +29,21 @@ class CommitValidator:
         Returns:
             bool: True if message is valid, False otherwise
         """
-        if not message:
-            return False
-            
-        # Check length
-        if len(message) > self.config['commit']['rules']['max_length']:
-            return False
-            
-        # Check format based on type
-        message_type = message.split(':')[0].strip()
-        if message_type not in self.config['commit']['rules']['allowed_types']:
-            return False
+        return self.check(message)[0]
+        
+    def _message_type(self, message: str) -> str:
+        """Get the type of a commit message, without its scope
+        
+        Args:
+            message: Commit message
             
-        # Validate based on format
-        if 'conventional' in self.config['commit']['formats']:
-            return self._validate_conventional(message)
-        elif 'semantic' in self.config['commit']['formats']:
-            return self._validate_semantic(message)
-        return True
+        Returns:
+            str: Commit type (e.g., 'feat' for 'feat(cli): ...')
+        """
+        idx = message.find(':')
+        if idx < 0:
+            return message.strip()
+        return message[:idx].split('(', 1)[0].strip()
         
     def _validate_conventional(self, message: str) -> bool:
         """Validate conventional commit format
@@ -51,8 +54,7 @@ class CommitValidator:
         Returns:
             bool: True if message is valid conventional commit, False otherwise
         """
-        pattern = r'^(feat|fix|docs|style|refactor|test|chore)\(([^)]+)\): .+$'
-        return bool(re.match(pattern, message))
+        return bool(_CONVENTIONAL_RE.match(message))
         
     def _validate_semantic(self, message: str) -> bool:
         """Validate semantic commit format
@@ -63,8 +65,7 @@ class CommitValidator:
         Returns:
             bool: True if message is valid semantic commit, False otherwise
         """
-        pattern = r'^(build|ci|docs|feat|fix|perf|refactor|style|test|chore)\(([^)]+)\): .+$'
-        return bool(re.match(pattern, message))
+        return bool(_SEMANTIC_RE.match(message))
         
     def get_validation_errors(self, message: str) -> list:
         """Get list of validation errors for a commit message
@@ -75,27 +76,39 @@ class CommitValidator:
         Returns:
             list: List of validation errors
         """
+        return self.check(message)[1]
+        
+    def check(self, message: str) -> Tuple[bool, List[str]]:
+        """Validate a commit message and collect its errors in one pass
+        
+        Args:
+            message: Commit message to validate
+            
+        Returns:
+            Tuple[bool, List[str]]: Whether the message is valid, and its
+            validation errors
+        """
         errors = []
         
         if not message:
             errors.append("Commit message cannot be empty")
-            return errors
+            return False, errors
             
         # Check length
-        if len(message) > self.config['commit']['rules']['max_length']:
-            errors.append(f"Commit message exceeds maximum length of {self.config['commit']['rules']['max_length']} characters")
+        if len(message) > self._max_len:
+            errors.append(f"Commit message exceeds maximum length of {self._max_len} characters")
             
         # Check format based on type
-        message_type = message.split(':')[0].strip()
-        if message_type not in self.config['commit']['rules']['allowed_types']:
-            errors.append(f"Invalid commit type '{message_type}'. Must be one of: {', '.join(self.config['commit']['rules']['allowed_types'])}")
+        message_type = self._message_type(message)
+        if message_type not in self._rules['allowed_types']:
+            errors.append(f"Invalid commit type '{message_type}'. Must be one of: {', '.join(sorted(self._rules['allowed_types']))}")
             
         # Validate based on format
-        if 'conventional' in self.config['commit']['formats']:
+        if 'conventional' in self._formats:
             if not self._validate_conventional(message):
                 errors.append("Commit message does not follow conventional commit format")
-        elif 'semantic' in self.config['commit']['formats']:
+        elif 'semantic' in self._formats:
             if not self._validate_semantic(message):
                 errors.append("Commit message does not follow semantic commit format")
                 
-        return errors
+        return not errors, errors
@@ -1,10 +1,26 @@
+import copy
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Use the libyaml C parser and emitter when PyYAML was built with them
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class _ConfigDumper(getattr(yaml, 'CSafeDumper', yaml.SafeDumper)):
+    """Safe YAML dumper that writes frozensets as sorted lists"""
+
+
+_ConfigDumper.add_representer(
+    frozenset, lambda dumper, data: dumper.represent_list(sorted(data)))
+
+# Parsed configurations by resolved path, with the file's mtime when read
+# (None if the file did not exist), shared by every ConfigManager
+_CONFIG_CACHE: Dict[Path, Tuple[Optional[int], Dict[str, Any]]] = {}
+
 class ConfigManager:
     """Manage configuration for Git utilities"""
     
@@ -23,6 +39,13 @@ class ConfigManager:
             'pre-push': True,
             'pre-rebase': True
         },
+        'status': {
+            # Let git skip unchanged directories when listing untracked
+            # files; this writes the repository's git config
+            'untracked_cache': False,
+            # Also apply git's large-repository defaults (feature.manyFiles)
+            'many_files': False
+        },
         'logging': {
             'level': 'INFO',
             'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -35,29 +58,53 @@ class ConfigManager:
         Args:
             config_path: Path to configuration file. If None, looks for git-utils.yml in current directory.
         """
-        self.config_path = config_path or Path('.').joinpath('git-utils.yml')
-        self.config = self._load_config()
+        self.config_path = Path(config_path or 'git-utils.yml').resolve()
+        self.config = self._cached_config()
+        
+    def _cached_config(self) -> Dict[str, Any]:
+        """Return the parsed configuration, re-reading it only if the file changed"""
+        try:
+            mtime = self.config_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = _CONFIG_CACHE.get(self.config_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        config = self._load_config()
+        _CONFIG_CACHE[self.config_path] = (mtime, config)
+        return config
         
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or return default"""
         try:
             if self.config_path.exists():
                 with open(self.config_path, 'r') as f:
-                    config = yaml.safe_load(f)
+                    config = yaml.load(f, Loader=_SafeLoader)
                 return self._validate_config(config)
-            return self.DEFAULT_CONFIG
+            return self._validate_config({})
         except Exception as e:
             logger.warning(f"Error loading config: {e}")
-            return self.DEFAULT_CONFIG
+            return self._validate_config({})
             
     def _validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate configuration against default schema"""
+        # Copy the sections so the cached config never shares objects with
+        # DEFAULT_CONFIG
         validated = {}
         for section, default in self.DEFAULT_CONFIG.items():
             if section in config:
-                validated[section] = {**default, **config[section]}
+                validated[section] = copy.deepcopy({**default, **config[section]})
             else:
-                validated[section] = default
+                validated[section] = copy.deepcopy(default)
+        # Commit types and formats are checked by membership on every
+        # validation
+        commit = dict(validated['commit'])
+        rules = commit.get('rules', {})
+        if 'allowed_types' in rules:
+            commit['rules'] = {**rules, 'allowed_types': frozenset(rules['allowed_types'])}
+        if 'formats' in commit:
+            commit['formats'] = frozenset(commit['formats'])
+        validated['commit'] = commit
         return validated
     
     def get_config(self) -> Dict[str, Any]:
@@ -66,14 +113,16 @@ class ConfigManager:
     
     def update_config(self, new_config: Dict[str, Any]) -> None:
         """Update configuration and save to file"""
-        self.config.update(new_config)
+        # The loaded config is shared with other managers through the
+        # cache, so build a new one; they re-read the file once it's saved
+        self.config = {**self.config, **new_config}
         try:
             with open(self.config_path, 'w') as f:
-                yaml.dump(self.config, f)
+                yaml.dump(self.config, f, Dumper=_ConfigDumper)
         except Exception as e:
             logger.error(f"Error saving config: {e}")
             
-    def get_commit_formats(self) -> list:
+    def get_commit_formats(self) -> frozenset:
         """Get supported commit message formats"""
         return self.config['commit']['formats']
     
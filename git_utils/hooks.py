@@ -1,21 +1,31 @@
 from git import Repo
+from pathlib import Path
 from typing import Callable, Optional
 import os
+import tempfile
 from .config import ConfigManager
-from .logger import GitLogger
+from .logger import get_logger
 
 class HookManager:
-    def __init__(self, repo_path: str = '.', config: Optional[dict] = None):
+    def __init__(self, repo_path: str = '.', config: Optional[dict] = None,
+                 repo: Optional[Repo] = None):
         """Initialize hook manager
         
         Args:
             repo_path: Path to git repository
             config: Configuration dictionary
+            repo: Already opened repository to use instead of opening repo_path
         """
-        self.repo = Repo(repo_path)
-        self.config_manager = ConfigManager(config)
-        self.logger = GitLogger(config).get_logger()
-        self.hooks_dir = self.repo.git_dir / 'hooks'
+        self.repo = repo or Repo(repo_path)
+        self.config_manager = ConfigManager()
+        self._hooks_cfg = (config or self.config_manager.get_config())['hooks']
+        self.logger = get_logger(config)
+        # Ask git where hooks live, so core.hooksPath and linked worktrees
+        # (whose git_dir is .git/worktrees/<name>) are handled; the path is
+        # relative to the directory git ran in. Resolve it once.
+        hooks_path = self.repo.git.rev_parse('--git-path', 'hooks')
+        self.hooks_dir = (Path(self.repo.working_tree_dir or self.repo.git_dir)
+                          / hooks_path).resolve()
         
     def install_hook(self, hook_name: str, hook_content: str) -> None:
         """Install a git hook
@@ -27,14 +37,29 @@ class HookManager:
         Raises:
             ValueError: If hook is not enabled in configuration
         """
-        if not self.config_manager.is_hook_enabled(hook_name):
+        if not self._hooks_cfg.get(hook_name, False):
             raise ValueError(f"Hook '{hook_name}' is disabled in configuration")
             
         hook_path = self.hooks_dir / hook_name
         try:
-            with open(hook_path, 'w') as f:
-                f.write(hook_content)
-            hook_path.chmod(0o755)
+            # A configured core.hooksPath may not exist yet
+            self.hooks_dir.mkdir(parents=True, exist_ok=True)
+            # Write the hook next to its final path and rename it into
+            # place, so git never runs a partially written hook
+            fd, tmp_path = tempfile.mkstemp(dir=self.hooks_dir, prefix=f'.{hook_name}.')
+            try:
+                try:
+                    data = hook_content.encode()
+                    while data:
+                        data = data[os.write(fd, data):]
+                finally:
+                    os.close(fd)
+                # os.fchmod is unavailable on Windows before Python 3.13
+                os.chmod(tmp_path, 0o755)
+                os.replace(tmp_path, hook_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
             self.logger.info(f"Successfully installed {hook_name} hook")
         except Exception as e:
             self.logger.error(f"Error installing hook: {str(e)}")
@@ -46,7 +71,7 @@ class HookManager:
         Args:
             validation_func: Function to validate commit
         """
-        if not self.config_manager.is_hook_enabled('pre-commit'):
+        if not self._hooks_cfg.get('pre-commit', False):
             self.logger.warning("Pre-commit hook is disabled in configuration")
             return
             
@@ -61,7 +86,7 @@ python -c 'from git_utils.hooks import HookManager; HookManager().validate_commi
         Args:
             validation_func: Function to validate push
         """
-        if not self.config_manager.is_hook_enabled('pre-push'):
+        if not self._hooks_cfg.get('pre-push', False):
             self.logger.warning("Pre-push hook is disabled in configuration")
             return
             
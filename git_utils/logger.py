@@ -1,7 +1,26 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .config import ConfigManager
 
+_LOGGER: Optional[logging.Logger] = None
+
+def get_logger(config: Optional[Dict[str, Any]] = None) -> logging.Logger:
+    """Get the shared git-utils logger, configuring logging on first use
+    
+    Args:
+        config: Configuration dictionary. If None, uses default config.
+    """
+    global _LOGGER
+    if _LOGGER is None:
+        logging_config = (config or ConfigManager().get_config())['logging']
+        logging.basicConfig(
+            level=logging_config['level'],
+            format=logging_config['format'],
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        _LOGGER = logging.getLogger('git-utils')
+    return _LOGGER
+
 class GitLogger:
     """Custom logger for Git utilities"""
     
@@ -11,18 +30,20 @@ class GitLogger:
         Args:
             config: Configuration dictionary. If None, uses default config.
         """
-        self.config_manager = ConfigManager()
-        self.config = config or self.config_manager.get_config()
+        # get_logger() only loads the config the first time logging is
+        # configured, so don't build a ConfigManager here
+        self.config = config
         self._setup_logger()
         
     def _setup_logger(self) -> None:
         """Setup logging configuration"""
-        logging.basicConfig(
-            level=self.config['logging']['level'],
-            format=self.config['logging']['format'],
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        self.logger = logging.getLogger('git-utils')
+        self.logger = get_logger(self.config)
+        # Bind the level methods directly, so logging a line doesn't go
+        # through log()'s getattr dispatch
+        self.error = self.logger.error
+        self.warning = self.logger.warning
+        self.info = self.logger.info
+        self.debug = self.logger.debug
         
     def get_logger(self) -> logging.Logger:
         """Get configured logger instance"""
@@ -38,19 +59,3 @@ class GitLogger:
         """
         method = getattr(self.logger, level.lower())
         method(message, **kwargs)
-        
-    def error(self, message: str, **kwargs) -> None:
-        """Log an error message"""
-        self.log('error', message, **kwargs)
-        
-    def warning(self, message: str, **kwargs) -> None:
-        """Log a warning message"""
-        self.log('warning', message, **kwargs)
-        
-    def info(self, message: str, **kwargs) -> None:
-        """Log an info message"""
-        self.log('info', message, **kwargs)
-        
-    def debug(self, message: str, **kwargs) -> None:
-        """Log a debug message"""
-        self.log('debug', message, **kwargs)
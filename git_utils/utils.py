@@ -1,28 +1,93 @@
 from git import Repo
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import os
+import time
 from .config import ConfigManager
-from .logger import GitLogger
+from .logger import get_logger
+
+# Seconds a repository status may be reused while the index is unchanged.
+# Changes to untracked or unstaged files don't touch the index, so this
+# bounds how stale a reused status can be.
+STATUS_CACHE_TTL = 2.0
+
+# Status results by (git dir, include_untracked), with the time they were
+# read and the index mtime at that point
+_status_cache: Dict[Tuple[str, bool], Tuple[float, Optional[int], dict]] = {}
+
+# Read-only git calls skip optional locks (such as refreshing the index
+# stat cache), so they neither take .git/index.lock nor block other git
+# processes
+_READ_ONLY_ENV = {'GIT_OPTIONAL_LOCKS': '0'}
 
 class GitUtils:
-    def __init__(self, repo_path: str = '.', config: Optional[dict] = None):
+    def __init__(self, repo_path: str = '.', config: Optional[dict] = None,
+                 repo: Optional[Repo] = None):
         """Initialize Git utilities
         
         Args:
             repo_path: Path to git repository
             config: Configuration dictionary
+            repo: Already opened repository to use instead of opening repo_path
         """
-        self.repo = Repo(repo_path)
-        self.config_manager = ConfigManager(config)
-        self.logger = GitLogger(config).get_logger()
+        self.repo = repo or Repo(repo_path)
+        self.config_manager = ConfigManager()
+        self.logger = get_logger(config)
+        # Current branch with the HEAD (inode, mtime) it was read at
+        self._branch_cache: Optional[Tuple[Tuple[int, int], str]] = None
+        status_config = (config or self.config_manager.get_config()).get('status', {})
+        if status_config.get('untracked_cache'):
+            self.enable_untracked_cache(many_files=status_config.get('many_files', False))
+        
+    def enable_untracked_cache(self, many_files: bool = False) -> None:
+        """Enable git's untracked cache for this repository
+        
+        With the cache, listing untracked files only rescans directories
+        whose mtime changed instead of walking the whole working directory.
+        Does nothing if the cache is already enabled.
+        
+        Args:
+            many_files: Also set feature.manyFiles, git's defaults for large
+                repositories (including index version 4)
+        """
+        reader = self.repo.config_reader()
+        if reader.get_value('core', 'untrackedCache', False) is True:
+            return
+        try:
+            with self.repo.config_writer() as writer:
+                writer.set_value('core', 'untrackedCache', 'true')
+                if many_files:
+                    writer.set_value('feature', 'manyFiles', 'true')
+            # Add the cache to the index now; read-only status calls don't
+            # write the index
+            args = ['--untracked-cache']
+            if many_files:
+                args.extend(['--index-version', '4'])
+            self.repo.git.update_index(*args)
+            self.logger.debug("Enabled the untracked cache")
+        except Exception as e:
+            self.logger.warning(f"Could not enable the untracked cache: {str(e)}")
         
     def get_current_branch(self) -> str:
         """Get current branch name
         
+        HEAD is read directly rather than through git, and the name is
+        reused until HEAD is rewritten.
+        
         Returns:
-            str: Current branch name
+            str: Current branch name, or the commit hash if HEAD is detached
         """
         try:
-            branch = self.repo.active_branch.name
+            # git rewrites HEAD through a lock file and rename, so a new
+            # HEAD also has a new inode
+            head = os.stat(os.path.join(self.repo.git_dir, 'HEAD'))
+            head_key = (head.st_ino, head.st_mtime_ns)
+            if self._branch_cache and self._branch_cache[0] == head_key:
+                return self._branch_cache[1]
+            with open(os.path.join(self.repo.git_dir, 'HEAD')) as f:
+                head_ref = f.read().strip()
+            # A detached HEAD holds the commit hash itself
+            branch = head_ref[len('ref: refs/heads/'):] if head_ref.startswith('ref: refs/heads/') else head_ref
+            self._branch_cache = (head_key, branch)
             self.logger.debug(f"Current branch: {branch}")
             return branch
         except Exception as e:
@@ -36,7 +101,9 @@ class GitUtils:
             bool: True if clean, False otherwise
         """
         try:
-            is_clean = not self.repo.is_dirty()
+            # One status call covers staged, unstaged and untracked changes;
+            # is_dirty() runs a separate diff for the index and worktree
+            is_clean = not self.repo.git.status('--porcelain', env=_READ_ONLY_ENV)
             self.logger.debug(f"Working directory is {'clean' if is_clean else 'dirty'}")
             return is_clean
         except Exception as e:
@@ -50,7 +117,9 @@ class GitUtils:
             List[str]: List of untracked files
         """
         try:
-            untracked = self.repo.untracked_files
+            # Read fresh: new files don't touch the index that keys the
+            # get_status cache
+            untracked = self._read_status(True)['untracked_files']
             self.logger.debug(f"Found {len(untracked)} untracked files")
             return untracked
         except Exception as e:
@@ -87,22 +156,104 @@ class GitUtils:
             self.logger.error(f"Error getting local branches: {str(e)}")
             raise
             
-    def get_status(self) -> dict:
+    def get_status(self, include_untracked: bool = True) -> dict:
         """Get repository status
         
+        Reads everything with two git calls: one porcelain status for the
+        branch and working directory, and one for-each-ref for the branches.
+        Repeated calls within STATUS_CACHE_TTL seconds reuse the result
+        while the index is unchanged.
+        
+        Args:
+            include_untracked: Whether to look for untracked files, which
+                walks the whole working directory
+        
         Returns:
             dict: Repository status information
         """
         try:
-            status = {
-                'branch': self.get_current_branch(),
-                'is_clean': self.is_clean_working_directory(),
-                'untracked_files': self.get_untracked_files(),
-                'local_branches': self.get_local_branches(),
-                'remote_branches': self.get_remote_branches()
-            }
+            key = (self.repo.git_dir, include_untracked)
+            try:
+                index_mtime = os.stat(os.path.join(self.repo.git_dir, 'index')).st_mtime_ns
+            except OSError:
+                index_mtime = None
+            now = time.monotonic()
+            cached = _status_cache.get(key)
+            if cached and now - cached[0] < STATUS_CACHE_TTL and cached[1] == index_mtime:
+                self.logger.debug("Reusing cached repository status")
+                return _copy_status(cached[2])
+                
+            status = self._read_status(include_untracked)
+            status.update(self._read_branches())
+            _status_cache[key] = (now, index_mtime, status)
             self.logger.debug("Successfully got repository status")
-            return status
+            return _copy_status(status)
         except Exception as e:
             self.logger.error(f"Error getting repository status: {str(e)}")
             raise
+            
+    def _read_status(self, include_untracked: bool = True) -> dict:
+        """Read the branch, cleanliness and untracked files in one git call
+        
+        Args:
+            include_untracked: Whether to look for untracked files
+        
+        Returns:
+            dict: 'branch', 'is_clean' and 'untracked_files' entries
+        """
+        # --no-ahead-behind skips counting commits against the upstream,
+        # which can walk a long history
+        output = self.repo.git.status(
+            '--porcelain=v2', '--branch', '--no-ahead-behind', '-z',
+            '--untracked-files=all' if include_untracked else '--untracked-files=no',
+            env=_READ_ONLY_ENV)
+        branch = oid = None
+        changed = False
+        untracked = []
+        entries = iter(output.split('\0'))
+        for entry in entries:
+            if entry.startswith('# branch.oid '):
+                oid = entry[len('# branch.oid '):]
+            elif entry.startswith('# branch.head '):
+                branch = entry[len('# branch.head '):]
+            elif entry.startswith('? '):
+                untracked.append(entry[2:])
+            elif entry[:2] in ('1 ', '2 ', 'u '):
+                changed = True
+                if entry.startswith('2 '):
+                    # Renames and copies are followed by their original path
+                    next(entries, None)
+        # Match get_current_branch, which gives the commit hash when detached
+        if branch == '(detached)':
+            branch = oid
+        return {
+            'branch': branch,
+            'is_clean': not changed and not untracked,
+            'untracked_files': untracked
+        }
+        
+    def _read_branches(self) -> dict:
+        """Read local and remote branch names in one git call
+        
+        Returns:
+            dict: 'local_branches' and 'remote_branches' entries
+        """
+        local_branches = []
+        remote_branches = []
+        refs = self.repo.git.for_each_ref('--format=%(refname)', 'refs/heads', 'refs/remotes',
+                                          env=_READ_ONLY_ENV)
+        for ref in refs.splitlines():
+            if ref.startswith('refs/heads/'):
+                local_branches.append(ref[len('refs/heads/'):])
+            elif ref.startswith('refs/remotes/'):
+                remote_branches.append(ref[len('refs/remotes/'):])
+        return {
+            'local_branches': local_branches,
+            'remote_branches': remote_branches
+        }
+
+
+def _copy_status(status: dict) -> dict:
+    """Copy a status dict, including its lists, so callers can't modify the cache"""
+    return {key: list(value) if isinstance(value, list) else value
+            for key, value in status.items()}
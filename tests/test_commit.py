@@ -2,6 +2,14 @@ import pytest
 from git_utils.commit import CommitManager
 from git import Repo
 
+@pytest.fixture
+def git_identity(monkeypatch):
+    """Give git commands an author and committer"""
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "Test")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "test@example.com")
+
 def test_commit_message_validation():
     """Test commit message validation"""
     manager = CommitManager()
@@ -16,7 +24,7 @@ def test_commit_message_validation():
     assert manager.validate_message("too long message that exceeds the recommended length") == False
     assert manager.validate_message("") == False
 
-def test_create_commit(tmp_path):
+def test_create_commit(tmp_path, git_identity):
     """Test creating a commit"""
     # Create a temporary git repository
     repo_path = tmp_path / "repo"
@@ -36,3 +44,61 @@ def test_create_commit(tmp_path):
     # Verify commit was created
     assert len(list(repo.iter_commits())) == 1
     assert repo.head.commit.message == "feat: add test file\n"
+
+def test_scoped_commit_message_validation():
+    """Test that the commit type is read without its scope"""
+    from git_utils.commit_validator import CommitValidator
+    validator = CommitValidator()
+
+    assert validator.validate_message("feat(cli): add new option") == True
+    assert validator.validate_message("feature(cli): add new option") == False
+    assert validator.get_validation_errors("feature(cli): add new option")[0].startswith(
+        "Invalid commit type 'feature'")
+
+def test_get_commit_history(tmp_path):
+    """Test reading commit history from git log"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    repo.index.commit("feat(core): first")
+    repo.index.commit("fix(core): second\n\nWith a body")
+
+    history = CommitManager(str(repo_path)).get_commit_history(limit=5)
+
+    expected = list(repo.iter_commits(max_count=5))
+    assert [c["sha"] for c in history] == [c.hexsha for c in expected]
+    assert [c["message"] for c in history] == [c.message for c in expected]
+    assert [c["author"] for c in history] == [c.author.name for c in expected]
+    assert [c["date"] for c in history] == [c.committed_datetime for c in expected]
+
+    columns = CommitManager(str(repo_path)).get_commit_history_columns(limit=5)
+    assert columns == {key: [c[key] for c in history] for key in history[0]}
+
+def test_revert_commit_rejects_invalid_hash(tmp_path):
+    """Test that reverting an unknown commit raises ValueError"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    sha = repo.index.commit("feat(core): first").hexsha
+    manager = CommitManager(str(repo_path))
+
+    assert manager.get_commit(sha[:7])["sha"] == sha
+    with pytest.raises(ValueError):
+        manager.revert_commit("deadbeef")
+
+def test_create_commit_skips_ignored_files(tmp_path, git_identity):
+    """Test that committing a directory leaves its ignored files out"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    (repo_path / ".gitignore").write_text("*.pyc\n")
+    (repo_path / "d").mkdir()
+    (repo_path / "d" / "a.py").write_text("a = 1\n")
+    (repo_path / "d" / "b.pyc").write_text("compiled")
+
+    manager = CommitManager(str(repo_path))
+    manager.create_commit("feat(core): add d", [str(repo_path / "d")])
+
+    committed = [blob.path for blob in repo.head.commit.tree.traverse()
+                 if blob.type == "blob"]
+    assert committed == ["d/a.py"]
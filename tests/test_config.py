@@ -0,0 +1,75 @@
+import os
+from git_utils import config as config_module
+from git_utils.config import ConfigManager
+
+def test_config_is_parsed_once(tmp_path, monkeypatch):
+    """Test that managers share the parsed config until the file changes"""
+    config_file = tmp_path / "git-utils.yml"
+    config_file.write_text("hooks:\n  pre-push: false\n")
+    loads = []
+    real_load = ConfigManager._load_config
+
+    def counting_load(self):
+        loads.append(self.config_path)
+        return real_load(self)
+
+    monkeypatch.setattr(ConfigManager, "_load_config", counting_load)
+    monkeypatch.setattr(config_module, "_CONFIG_CACHE", {})
+
+    first = ConfigManager(str(config_file))
+    second = ConfigManager(str(config_file))
+    assert not second.is_hook_enabled("pre-push")
+    assert first.config is second.config
+    assert len(loads) == 1
+
+    config_file.write_text("hooks:\n  pre-push: true\n")
+    os.utime(config_file, ns=(0, 0))
+    assert ConfigManager(str(config_file)).is_hook_enabled("pre-push")
+    assert len(loads) == 2
+
+def test_update_config_round_trips(tmp_path, monkeypatch):
+    """Test that a saved config, including its allowed types, loads back"""
+    config_file = tmp_path / "git-utils.yml"
+    monkeypatch.setattr(config_module, "_CONFIG_CACHE", {})
+
+    manager = ConfigManager(str(config_file))
+    manager.update_config({"hooks": {"pre-commit": False}})
+
+    monkeypatch.setattr(config_module, "_CONFIG_CACHE", {})
+    reloaded = ConfigManager(str(config_file))
+    assert not reloaded.is_hook_enabled("pre-commit")
+    assert reloaded.get_commit_rules()["allowed_types"] == manager.get_commit_rules()["allowed_types"]
+
+def test_commit_rules_are_frozensets(tmp_path, monkeypatch):
+    """Test that allowed types and formats are loaded as frozensets"""
+    config_file = tmp_path / "git-utils.yml"
+    config_file.write_text("commit:\n  formats: [semantic]\n")
+    monkeypatch.setattr(config_module, "_CONFIG_CACHE", {})
+
+    manager = ConfigManager(str(config_file))
+
+    assert manager.get_commit_formats() == frozenset({"semantic"})
+    assert isinstance(manager.get_commit_rules()["allowed_types"], frozenset)
+    assert isinstance(ConfigManager.DEFAULT_CONFIG["commit"]["formats"], list)
+
+def test_failed_update_does_not_leak(tmp_path, monkeypatch):
+    """Test that an unsaved update stays out of the shared config and defaults"""
+    config_file = tmp_path / "missing" / "git-utils.yml"
+    monkeypatch.setattr(config_module, "_CONFIG_CACHE", {})
+
+    manager = ConfigManager(str(config_file))
+    assert manager.get_config()["hooks"] is not ConfigManager.DEFAULT_CONFIG["hooks"]
+    manager.update_config({"logging": {"level": "DEBUG"}})
+
+    assert not config_file.exists()
+    assert ConfigManager(str(config_file)).get_logging_config()["level"] == "INFO"
+    assert ConfigManager.DEFAULT_CONFIG["logging"]["level"] == "INFO"
+
+def test_git_logger_reuses_configured_logger(monkeypatch):
+    """Test that a GitLogger doesn't load the config once logging is set up"""
+    from git_utils import logger as logger_module
+    from git_utils.logger import GitLogger, get_logger
+    shared = get_logger()
+    monkeypatch.setattr(logger_module, "ConfigManager", None)
+
+    assert GitLogger().get_logger() is shared
@@ -0,0 +1,511 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import types
+import pytest
+import devkit.docker
+from devkit.docker import (
+    build_and_push_docker_image,
+    generate_docker_tags,
+    push_docker_image,
+    tag_docker_image,
+)
+
+@pytest.fixture
+def docker_build(tmp_path, monkeypatch):
+    """Provide a Dockerfile and record the build commands instead of running them"""
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM scratch\n")
+    calls = []
+
+    def fake_stream(cmd, env=None, output=None):
+        calls.append((cmd, env))
+        return 0, ""
+
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "_stream_command", fake_stream)
+    return types.SimpleNamespace(dockerfile=str(dockerfile), calls=calls)
+
+def test_generate_docker_tags():
+    """Test generating semantic version tags"""
+    tags = generate_docker_tags("org/app", "1.2.3")
+    assert tags == ["org/app:1.2.3", "org/app:1.2", "org/app:1", "org/app:latest"]
+
+def test_generate_docker_tags_without_latest():
+    """Test generating tags without the latest tag"""
+    tags = generate_docker_tags("org/app", "1.2.3", include_latest=False)
+    assert "org/app:latest" not in tags
+    assert len(tags) == len(set(tags))
+
+def test_generate_docker_tags_with_chainguard_tags(monkeypatch):
+    """Test adding the date and commit hash tags"""
+    monkeypatch.setattr(devkit.docker.time, "strftime", lambda fmt: "20240501")
+    monkeypatch.setattr(devkit.docker, "get_git_commit_hash", lambda: "a1b2c3d")
+    tags = generate_docker_tags("org/app", "1.2.3", include_latest=False,
+                                chainguard_tags=True)
+    assert tags == ["org/app:1.2.3", "org/app:1.2", "org/app:1",
+                    "org/app:20240501", "org/app:a1b2c3d"]
+
+def test_push_docker_image_keeps_order(monkeypatch):
+    """Test that concurrent pushes report successes in input order"""
+    def fake_run(cmd, check, **kwargs):
+        if cmd[-1] == "org/app:bad":
+            raise subprocess.CalledProcessError(1, cmd)
+
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker.subprocess, "run", fake_run)
+
+    tags = ["org/app:1.2.3", "org/app:bad", "org/app:1.2", "org/app:1"]
+    assert push_docker_image(tags) == ["org/app:1.2.3", "org/app:1.2", "org/app:1"]
+
+def test_generate_docker_tags_short_version():
+    """Test generating tags for a version without minor/patch parts"""
+    tags = generate_docker_tags("org/app", "1", include_latest=False)
+    assert tags == ["org/app:1", "org/app:1.0"]
+
+def test_build_and_push_docker_image(docker_build):
+    """Test that every tag is built and pushed by one buildx command"""
+    tags = ["org/app:1.2.3", "org/app:1.2"]
+    pushed = build_and_push_docker_image(
+        tags, dockerfile_path=docker_build.dockerfile, cache_from="org/app:latest")
+
+    assert pushed == tags
+    assert len(docker_build.calls) == 1
+    cmd, env = docker_build.calls[0]
+    assert cmd[:4] == ["docker", "buildx", "build", "--push"]
+    assert cmd.count("-t") == 2
+    assert "type=registry,ref=org/app:latest" in cmd
+    assert env["DOCKER_BUILDKIT"] == "1"
+
+def test_tag_docker_image_falls_back_to_cli(monkeypatch):
+    """Test tagging through the docker CLI when the SDK is unavailable"""
+    calls = []
+
+    def fake_run(cmd, check=True):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "_docker_client", lambda: None)
+    monkeypatch.setattr(devkit.docker.subprocess, "run", fake_run)
+
+    tagged = tag_docker_image("app:1.2.3", ["org/app:1.2.3", "org/app:1.2"])
+
+    assert tagged == ["org/app:1.2.3", "org/app:1.2"]
+    assert ["docker", "tag", "app:1.2.3", "org/app:1.2.3"] in calls
+    assert len(calls) == 2
+
+def test_split_image_tag():
+    """Test splitting image references around registry ports"""
+    split = devkit.docker._split_image_tag
+    assert split("org/app:1.2") == ("org/app", "1.2")
+    assert split("registry:5000/org/app") == ("registry:5000/org/app", "latest")
+    assert split("registry:5000/org/app:1") == ("registry:5000/org/app", "1")
+
+def test_push_parallelism_from_environment(monkeypatch):
+    """Test that DEVKIT_PUSH_PARALLELISM bounds the worker count"""
+    monkeypatch.setenv("DEVKIT_PUSH_PARALLELISM", "2")
+    assert devkit.docker._max_workers() == 2
+    monkeypatch.setenv("DEVKIT_PUSH_PARALLELISM", "lots")
+    assert devkit.docker._max_workers() == devkit.docker.MAX_PUSH_WORKERS
+
+def test_read_json_output():
+    """Test parsing JSON from a command's output"""
+    data = devkit.docker._read_json_output(
+        ["sh", "-c", "echo '{\"Results\": [1, 2]}'; echo noise >&2"])
+    assert data == {"Results": [1, 2]}
+
+def test_read_json_output_failure():
+    """Test that a failing command raises with its stderr"""
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        devkit.docker._read_json_output(["sh", "-c", "echo boom >&2; exit 2"])
+    assert "boom" in excinfo.value.stderr
+
+def test_scan_docker_image_uses_exit_code(monkeypatch):
+    """Test that text scans show the full table and decide on Trivy's exit code"""
+    calls = []
+    check_code = 0
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        if "--exit-code" in cmd:
+            return subprocess.CompletedProcess(cmd, check_code, None, "")
+        return subprocess.CompletedProcess(cmd, 0, "HIGH and CRITICAL table", "")
+
+    monkeypatch.setattr(devkit.docker, "check_tool_installed", lambda name: True)
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker.subprocess, "run", fake_run)
+
+    assert devkit.docker.scan_docker_image("org/app:1.0") == (True, "HIGH and CRITICAL table")
+    assert "--severity" not in calls[0]
+    exit_code = calls[1][calls[1].index("--exit-code") + 1]
+
+    # Findings are signalled with the dedicated exit code
+    check_code = int(exit_code)
+    assert devkit.docker.scan_docker_image("org/app:1.0") == (False, "HIGH and CRITICAL table")
+
+    # Trivy's own failures are raised as scan errors, with its stderr
+    monkeypatch.setattr(devkit.docker.subprocess, "run", lambda cmd, **kwargs:
+                        subprocess.CompletedProcess(cmd, 1, "", "FATAL image not found"))
+    with pytest.raises(devkit.docker.ScanError, match="FATAL image not found"):
+        devkit.docker.scan_docker_image("org/app:1.0")
+
+def test_build_docker_image_registry_cache(docker_build):
+    """Test that registry cache import/export switches the build to buildx"""
+    devkit.docker.build_docker_image(
+        dockerfile_path=docker_build.dockerfile, image_name="org/app:1.0",
+        cache_from=["org/app:cache"], cache_to="org/app:cache")
+
+    cmd, env = docker_build.calls[0]
+    assert cmd[:4] == ["docker", "buildx", "build", "--load"]
+    assert "type=registry,ref=org/app:cache" in cmd
+    assert "type=registry,ref=org/app:cache,mode=max" in cmd
+    assert env["DOCKER_BUILDKIT"] == "1"
+
+def test_build_docker_image_without_buildx(docker_build, monkeypatch):
+    """Test falling back to the classic builder when buildx is missing"""
+    pulled = []
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: False)
+    monkeypatch.setattr(devkit.docker, "_pull_missing_images", pulled.extend)
+
+    devkit.docker.build_docker_image(
+        dockerfile_path=docker_build.dockerfile, image_name="org/app:1.0",
+        cache_from=["org/app:cache"])
+
+    cmd, env = docker_build.calls[0]
+    assert cmd[:2] == ["docker", "build"]
+    assert "--progress=plain" not in cmd
+    assert "org/app:cache" in cmd
+    assert env["DOCKER_BUILDKIT"] == "0"
+    assert pulled == ["org/app:cache"]
+
+def test_stream_command_drains_after_stdout_closes(monkeypatch):
+    """Test that output is still drained when our stdout goes away"""
+    import io
+
+    class ClosedStdout:
+        buffer = io.BytesIO()
+
+    ClosedStdout.buffer.close()
+    monkeypatch.setattr(devkit.docker.sys, "stdout", ClosedStdout)
+
+    cmd = [sys.executable, "-c", "for i in range(3): print(i)"]
+    returncode, tail = devkit.docker._stream_command(cmd)
+
+    assert returncode == 0
+    assert tail.split() == ["0", "1", "2"]
+
+def test_build_and_push_multi_platform(docker_build):
+    """Test that several platforms are built by one buildx invocation"""
+    build_and_push_docker_image(
+        ["org/app:1.0"], dockerfile_path=docker_build.dockerfile,
+        platform=["linux/amd64", "linux/arm64"])
+
+    assert len(docker_build.calls) == 1
+    assert "linux/amd64,linux/arm64" in docker_build.calls[0][0]
+
+def test_build_docker_image_rejects_multi_platform(docker_build):
+    """Test that multi-platform builds are not attempted locally"""
+    with pytest.raises(devkit.docker.DockerError):
+        devkit.docker.build_docker_image(
+            dockerfile_path=docker_build.dockerfile, image_name="org/app:1.0",
+            platform="linux/amd64,linux/arm64")
+
+def test_build_docker_image_rejects_directory_dockerfile(tmp_path, monkeypatch):
+    """Test that a directory passed as the Dockerfile is rejected up front"""
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+
+    with pytest.raises(devkit.docker.DockerError, match="not a regular file"):
+        devkit.docker.build_docker_image(
+            dockerfile_path=str(tmp_path), image_name="org/app:1.0")
+
+def test_push_image_with_tags_uses_imagetools(monkeypatch):
+    """Test that extra tags are published registry-side in one call"""
+    calls = []
+
+    def fake_run(cmd, check=True, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker.subprocess, "run", fake_run)
+
+    pushed = devkit.docker.push_image_with_tags(
+        "org/app:1.2.3", ["org/app:1.2", "org/app:1"])
+
+    assert pushed == ["org/app:1.2.3", "org/app:1.2", "org/app:1"]
+    assert calls == [
+        ["docker", "push", "org/app:1.2.3"],
+        ["docker", "buildx", "imagetools", "create",
+         "-t", "org/app:1.2", "-t", "org/app:1", "org/app:1.2.3"],
+    ]
+
+def test_push_image_with_tags_pushes_other_repositories(monkeypatch):
+    """Test that tags outside the image's repository are pushed directly"""
+    calls = []
+
+    def fake_run(cmd, check=True, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker.subprocess, "run", fake_run)
+
+    pushed = devkit.docker.push_image_with_tags(
+        "org/app:1.2.3", ["mirror/app:1.2.3", "org/app:1"])
+
+    assert pushed == ["org/app:1.2.3", "mirror/app:1.2.3", "org/app:1"]
+    assert ["docker", "buildx", "imagetools", "create",
+            "-t", "org/app:1", "org/app:1.2.3"] in calls
+    assert ["docker", "push", "mirror/app:1.2.3"] in calls
+
+def test_trivy_server_lifecycle(tmp_path, monkeypatch):
+    """Test that trivy_server waits for the server and stops it afterwards"""
+    fake_trivy = tmp_path / "trivy"
+    fake_trivy.write_text(
+        "#!/bin/sh\n"
+        "port=${3##*:}\n"
+        f"exec {sys.executable} -m http.server \"$port\" --bind 127.0.0.1\n")
+    fake_trivy.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    monkeypatch.setattr(devkit.docker, "check_tool_installed", lambda name: True)
+
+    with devkit.docker.trivy_server(timeout=10) as url:
+        assert url.startswith("http://127.0.0.1:")
+        port = int(url.rsplit(":", 1)[1])
+        socket.create_connection(("127.0.0.1", port), timeout=1).close()
+
+    with pytest.raises(OSError):
+        socket.create_connection(("127.0.0.1", port), timeout=1).close()
+
+def test_iter_docker_tags_matches_generate():
+    """Test that the lazy tag iterator yields the same tags"""
+    tags = devkit.docker.iter_docker_tags("org/app", "1.2.3")
+    assert not isinstance(tags, list)
+    assert list(tags) == generate_docker_tags("org/app", "1.2.3")
+
+def test_image_exists_local(tmp_path, monkeypatch):
+    """Test asking the Docker API over its Unix socket for a local image"""
+    import http.server
+    import socketserver
+    import threading
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/images/org/app:1.0/json" else 404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    class Server(socketserver.UnixStreamServer):
+        def get_request(self):
+            request, _ = super().get_request()
+            return request, ("local", 0)
+
+    socket_path = str(tmp_path / "docker.sock")
+    server = Server(socket_path, Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{socket_path}")
+    try:
+        assert devkit.docker._image_exists_local("org/app:1.0") is True
+        assert devkit.docker._image_exists_local("org/app:2.0") is False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    monkeypatch.setenv("DOCKER_HOST", "tcp://127.0.0.1:2375")
+    assert devkit.docker._image_exists_local("org/app:1.0") is None
+
+def test_check_tool_installed_is_cached(monkeypatch):
+    """Test that tool lookups run once per tool until the cache is cleared"""
+    lookups = []
+    monkeypatch.setattr(devkit.docker.shutil, "which",
+                        lambda name: lookups.append(name) or "/usr/bin/" + name)
+    devkit.docker.check_tool_installed.cache_clear()
+    try:
+        assert devkit.docker.check_tool_installed("devkit-tool")
+        assert devkit.docker.check_tool_installed("devkit-tool")
+        assert lookups == ["devkit-tool"]
+    finally:
+        devkit.docker.check_tool_installed.cache_clear()
+
+def test_secure_pipeline_runs_checks_concurrently(monkeypatch):
+    """Test that scan and SBOM generation overlap once the image is built"""
+    import threading
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_scan(image, output_format="text"):
+        barrier.wait()
+        return True, {"vulnerability_counts": {}}
+
+    def fake_sbom(image, output_file=None):
+        barrier.wait()
+        return True, output_file
+
+    monkeypatch.setattr(devkit.docker, "build_docker_image", lambda **kwargs: "app:1.0")
+    monkeypatch.setattr(devkit.docker, "test_docker_image", lambda *args: (True, "ok"))
+    monkeypatch.setattr(devkit.docker, "scan_docker_image", fake_scan)
+    monkeypatch.setattr(devkit.docker, "generate_sbom", fake_sbom)
+    monkeypatch.setattr(devkit.docker.os, "makedirs", lambda *a, **k: None)
+
+    results = devkit.docker.secure_pipeline(image_name="app:1.0")
+
+    assert results["scan"]["success"]
+    assert results["sbom"]["success"]
+
+def test_secure_pipeline_uses_registry_build_cache(monkeypatch):
+    """Test that a pushing pipeline imports and exports the registry build cache"""
+    builds = []
+
+    def fake_build(**kwargs):
+        builds.append(kwargs)
+        raise devkit.docker.DockerError("stop after the build")
+
+    monkeypatch.setattr(devkit.docker, "build_docker_image", fake_build)
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "check_buildx_cache_export", lambda: True)
+    monkeypatch.setattr(devkit.docker, "get_current_version", lambda: "1.0.0")
+
+    devkit.docker.secure_pipeline(
+        image_name="app:1.0", registry="example/app", push=True)
+
+    assert builds[0]["cache_from"] == ["example/app:buildcache"]
+    assert builds[0]["cache_to"] == "example/app:buildcache"
+
+    # The default 'docker' driver can't export cache, so only import it
+    monkeypatch.setattr(devkit.docker, "check_buildx_cache_export", lambda: False)
+    devkit.docker.secure_pipeline(
+        image_name="app:1.0", registry="example/app", push=True)
+
+    assert builds[1]["cache_from"] == ["example/app:buildcache"]
+    assert builds[1]["cache_to"] is None
+
+    # Without buildx the classic builder can't use the cache at all
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: False)
+    devkit.docker.secure_pipeline(
+        image_name="app:1.0", registry="example/app", push=True)
+
+    assert builds[2]["cache_from"] is None
+    assert builds[2]["cache_to"] is None
+
+def test_check_buildx_cache_export(monkeypatch):
+    """Test reading the active builder's driver from buildx inspect"""
+    def inspect(driver):
+        def fake_run(cmd, **kwargs):
+            return subprocess.CompletedProcess(
+                cmd, 0, f"Name:   default\nDriver: {driver}\n\nNodes:\n", "")
+        return fake_run
+
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: True)
+    try:
+        for driver, supported in [("docker", False), ("docker-container", True)]:
+            devkit.docker.check_buildx_cache_export.cache_clear()
+            monkeypatch.setattr(devkit.docker.subprocess, "run", inspect(driver))
+            assert devkit.docker.check_buildx_cache_export() == supported
+    finally:
+        devkit.docker.check_buildx_cache_export.cache_clear()
+
+def test_count_severities():
+    """Test counting severities from a streamed Trivy report"""
+    import io
+    report = {"Results": [
+        {"Vulnerabilities": [{"Severity": "HIGH"}, {"Severity": "CRITICAL"}]},
+        {"Vulnerabilities": None},
+        {"Vulnerabilities": [{"Severity": "HIGH", "Description": "CRITICAL"}]},
+    ]}
+    counts = devkit.docker._count_severities(io.BytesIO(json.dumps(report).encode()))
+    assert counts == {"CRITICAL": 1, "HIGH": 2, "MEDIUM": 0, "LOW": 0, "UNKNOWN": 0}
+
+def test_push_docker_image_with_client(monkeypatch):
+    """Test pushing through the Docker API and reading errors from the stream"""
+    requests = pytest.importorskip("requests")
+    pushed, clients = [], []
+
+    class FakeAPI:
+        def push(self, repository, tag, stream, decode):
+            pushed.append((repository, tag))
+            if tag == "bad":
+                return iter([{"status": "Preparing"}, {"error": "denied"}])
+            if tag == "dropped":
+                raise requests.exceptions.ConnectionError("connection reset")
+            return iter([{"status": "Pushed"}])
+
+    class FakeClient:
+        api = FakeAPI()
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def new_client():
+        clients.append(FakeClient())
+        return clients[-1]
+
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "_docker_client", lambda: FakeClient())
+    monkeypatch.setattr(devkit.docker, "_new_docker_client", new_client)
+    # Stand in for the optional SDK's exception module
+    errors = types.ModuleType("docker.errors")
+    errors.DockerException = type("DockerException", (Exception,), {})
+    monkeypatch.setitem(sys.modules, "docker.errors", errors)
+
+    result = push_docker_image(["org/app:1.0", "org/app:bad", "org/app:dropped"],
+                               max_workers=2)
+
+    assert result == ["org/app:1.0"]
+    assert sorted(pushed) == [("org/app", "1.0"), ("org/app", "bad"), ("org/app", "dropped")]
+    # Each worker thread pushes with its own client, closed afterwards
+    assert 1 <= len(clients) <= 2
+    assert all(client.closed for client in clients)
+
+def test_push_docker_image_skips_duplicates(monkeypatch):
+    """Test that a tag listed twice is pushed once"""
+    calls = []
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker.subprocess, "run",
+                        lambda cmd, **kwargs: calls.append(cmd))
+
+    assert push_docker_image(["org/app:1", "org/app:1", "org/app:2"]) == [
+        "org/app:1", "org/app:2"]
+    assert len(calls) == 2
+
+def test_check_kyverno_policy_reports_failures(monkeypatch):
+    """Test that a failed policy rule fails the check"""
+    policy_results = [{"policy": "a", "pass": True}, {"policy": "b", "pass": False}]
+
+    def fake_run(cmd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 0, json.dumps(policy_results).encode(), b"")
+
+    monkeypatch.setattr(devkit.docker, "check_tool_installed", lambda tool: True)
+    monkeypatch.setattr(devkit.docker.subprocess, "run", fake_run)
+
+    success, results = devkit.docker.check_kyverno_policy("deploy.yaml", "policy.yaml")
+
+    assert not success
+    assert results == policy_results
+
+def test_generate_sbom_return_bytes(monkeypatch):
+    """Test that the SBOM can be returned without a temporary file"""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append((cmd, kwargs))
+        return subprocess.CompletedProcess(cmd, 0, b'{"spdxVersion": "SPDX-2.3"}')
+
+    monkeypatch.setattr(devkit.docker, "check_tool_installed", lambda tool: tool == "syft")
+    monkeypatch.setattr(devkit.docker.subprocess, "run", fake_run)
+
+    success, sbom = devkit.docker.generate_sbom("app:1.0", return_bytes=True)
+
+    assert success
+    assert sbom == b'{"spdxVersion": "SPDX-2.3"}'
+    cmd, kwargs = calls[0]
+    assert "-f" not in cmd
+    assert kwargs["stdout"] == subprocess.PIPE
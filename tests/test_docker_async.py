@@ -0,0 +1,48 @@
+import asyncio
+import devkit.docker_async
+from devkit.docker_async import _run, apush_docker_image
+
+def test_run_captures_output():
+    """Test running a command on the event loop"""
+    returncode, stdout, _ = asyncio.run(_run(["sh", "-c", "echo hi"]))
+    assert returncode == 0
+    assert stdout == "hi\n"
+
+def test_run_missing_binary():
+    """Test that a missing executable is reported, not raised"""
+    returncode, _, stderr = asyncio.run(_run(["devkit-missing-binary"]))
+    assert returncode == 127
+    assert stderr
+
+def test_apush_docker_image_keeps_order(monkeypatch):
+    """Test that concurrent pushes report successes in input order"""
+    async def fake_run(cmd, env=None):
+        await asyncio.sleep(0.01 if cmd[-1].endswith("1") else 0)
+        return (1 if cmd[-1].endswith("2") else 0), "", "denied"
+
+    monkeypatch.setattr(devkit.docker_async, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker_async, "_run", fake_run)
+
+    pushed = asyncio.run(apush_docker_image(["org/app:1", "org/app:2", "org/app:3"]))
+    assert pushed == ["org/app:1", "org/app:3"]
+
+def test_abuild_docker_image_pulls_classic_builder_cache(tmp_path, monkeypatch):
+    """Test that the classic builder gets its cache images pulled first"""
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM scratch\n")
+    pulled, builds = [], []
+
+    async def fake_run(cmd, env=None):
+        builds.append(list(pulled))
+        return 0, "", ""
+
+    monkeypatch.setattr(devkit.docker, "check_docker_installed", lambda: True)
+    monkeypatch.setattr(devkit.docker, "check_buildx_installed", lambda: False)
+    monkeypatch.setattr(devkit.docker_async, "_pull_missing_images", pulled.extend)
+    monkeypatch.setattr(devkit.docker_async, "_run", fake_run)
+
+    asyncio.run(devkit.docker_async.abuild_docker_image(
+        dockerfile_path=str(dockerfile), image_name="org/app:1.0",
+        cache_from=["org/app:cache"]))
+
+    assert builds == [["org/app:cache"]]
@@ -40,3 +40,38 @@ def test_add_pre_commit_hook(tmp_path):
     hook_path = repo_path / ".git" / "hooks" / "pre-commit"
     assert hook_path.exists()
     assert os.access(hook_path, os.X_OK)
+
+def test_install_disabled_hook(tmp_path):
+    """Test that hooks disabled in the given config are not installed"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    Repo.init(str(repo_path))
+
+    from git_utils.config import ConfigManager
+    config = {**ConfigManager.DEFAULT_CONFIG, "hooks": {"pre-push": False}}
+    manager = HookManager(str(repo_path), config=config)
+
+    with pytest.raises(ValueError):
+        manager.install_hook("pre-push", "#!/bin/sh\n")
+    assert not (repo_path / ".git" / "hooks" / "pre-push").exists()
+
+def test_install_hook_from_linked_worktree(tmp_path, monkeypatch):
+    """Test that hooks go where git looks for them, not in a worktree's git dir"""
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "Test")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "test@example.com")
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    repo.git.commit("--allow-empty", "-m", "initial")
+    worktree_path = tmp_path / "worktree"
+    repo.git.worktree("add", str(worktree_path))
+
+    HookManager(str(worktree_path)).install_hook("pre-commit", "#!/bin/sh\n")
+    assert (repo_path / ".git" / "hooks" / "pre-commit").exists()
+
+    # core.hooksPath is honoured, relative to the working tree
+    repo.git.config("core.hooksPath", ".githooks")
+    HookManager(str(repo_path)).install_hook("pre-push", "#!/bin/sh\n")
+    assert (repo_path / ".githooks" / "pre-push").exists()
@@ -56,3 +56,120 @@ def test_get_untracked_files(tmp_path):
     assert len(untracked) == 2
     assert "file1.txt" in untracked
     assert "file2.txt" in untracked
+
+def test_get_status(tmp_path):
+    """Test reading the whole repository status"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    Repo.init(str(repo_path))
+    (repo_path / "new file.txt").write_text("content")
+
+    status = GitUtils(str(repo_path)).get_status()
+
+    assert status["branch"] == "master"
+    assert status["is_clean"] == False
+    assert status["untracked_files"] == ["new file.txt"]
+    assert status["local_branches"] == []
+    assert status["remote_branches"] == []
+
+def test_get_status_detached_head(tmp_path):
+    """Test that a detached HEAD reports the same branch as get_current_branch"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    sha = repo.index.commit("feat(core): first").hexsha
+    repo.git.checkout(sha)
+    utils = GitUtils(str(repo_path))
+
+    assert utils.get_status()["branch"] == sha
+    assert utils.get_current_branch() == sha
+
+def test_get_status_without_untracked(tmp_path):
+    """Test skipping the untracked file search"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    Repo.init(str(repo_path))
+    (repo_path / "file.txt").write_text("content")
+
+    status = GitUtils(str(repo_path)).get_status(include_untracked=False)
+
+    assert status["is_clean"] == True
+    assert status["untracked_files"] == []
+
+def test_get_status_is_cached_until_index_changes(tmp_path, monkeypatch):
+    """Test that repeated status calls reuse the result until the index changes"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    utils = GitUtils(str(repo_path))
+    reads = []
+    real_read = utils._read_status
+    monkeypatch.setattr(utils, "_read_status", lambda *args: reads.append(args) or real_read(*args))
+
+    utils.get_status()
+    utils.get_status()
+    assert len(reads) == 1
+
+    (repo_path / "file.txt").write_text("content")
+    repo.index.add(["file.txt"])
+    repo.index.write()
+    assert utils.get_status()["is_clean"] == False
+    assert len(reads) == 2
+
+def test_get_status_copies_cached_lists(tmp_path):
+    """Test that modifying a returned status leaves the cache intact"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    Repo.init(str(repo_path))
+    (repo_path / "file.txt").write_text("content")
+    utils = GitUtils(str(repo_path))
+
+    utils.get_status()["untracked_files"].append("other.txt")
+
+    assert utils.get_status()["untracked_files"] == ["file.txt"]
+
+def test_get_untracked_files_is_not_cached(tmp_path):
+    """Test that new files show up even while the status is cached"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    Repo.init(str(repo_path))
+    utils = GitUtils(str(repo_path))
+    utils.get_status()
+
+    (repo_path / "new.txt").write_text("content")
+
+    assert utils.get_untracked_files() == ["new.txt"]
+
+def test_enable_untracked_cache(tmp_path):
+    """Test enabling git's untracked cache from the config"""
+    from git_utils.config import ConfigManager
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+
+    config = {**ConfigManager.DEFAULT_CONFIG, "status": {"untracked_cache": True}}
+    GitUtils(str(repo_path), config=config)
+
+    assert repo.config_reader().get_value("core", "untrackedCache") is True
+
+def test_get_current_branch_follows_checkout(tmp_path):
+    """Test that the cached branch name is refreshed when HEAD changes"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    repo.index.commit("feat(core): first")
+    utils = GitUtils(str(repo_path))
+
+    assert utils.get_current_branch() == "master"
+    repo.git.checkout("-b", "feature")
+    assert utils.get_current_branch() == "feature"
+
+def test_get_current_branch_detached(tmp_path):
+    """Test that a detached HEAD reports its commit hash"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    repo = Repo.init(str(repo_path))
+    sha = repo.index.commit("feat(core): first").hexsha
+    repo.git.checkout("--detach")
+
+    assert GitUtils(str(repo_path)).get_current_branch() == sha
@@ -0,0 +1,91 @@
+import pytest
+from devkit.versioning import VersionBump, bump_version, parse_semantic_version
+
+def test_parse_semantic_version():
+    """Test parsing a semantic version"""
+    assert parse_semantic_version("1.2.3") == (1, 2, 3)
+
+def test_parse_semantic_version_rejects_partial_match():
+    """Test that versions with trailing text are rejected"""
+    for version in ["1.2", "1.2.3-rc1", "v1.2.3", "1.2.3\n"]:
+        with pytest.raises(ValueError):
+            parse_semantic_version(version)
+
+def test_bump_version():
+    """Test bumping each version component"""
+    assert bump_version("1.2.3", VersionBump.MAJOR) == "2.0.0"
+    assert bump_version("1.2.3", VersionBump.MINOR) == "1.3.0"
+    assert bump_version("1.2.3", VersionBump.PATCH) == "1.2.4"
+
+def test_update_version_in_files(tmp_path, monkeypatch):
+    """Test rewriting the version in __init__.py and setup.py"""
+    from devkit.versioning import update_version_in_files
+    (tmp_path / "devkit").mkdir()
+    (tmp_path / "devkit" / "__init__.py").write_text('__version__ = "1.2.3"\n')
+    (tmp_path / "setup.py").write_text('setup(\n    version="1.2.3",\n)\n')
+    monkeypatch.chdir(tmp_path)
+
+    assert update_version_in_files("1.3.0")
+
+    assert (tmp_path / "devkit" / "__init__.py").read_text() == '__version__ = "1.3.0"\n'
+    assert 'version="1.3.0"' in (tmp_path / "setup.py").read_text()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["devkit", "setup.py"]
+
+def test_get_current_version_is_cached(tmp_path, monkeypatch):
+    """Test that the version is read once until a version bump clears the cache"""
+    from devkit.versioning import get_current_version, update_version_in_files
+    (tmp_path / "devkit").mkdir()
+    (tmp_path / "devkit" / "__init__.py").write_text('__version__ = "1.2.3"\n')
+    (tmp_path / "setup.py").write_text('setup(\n    version="1.2.3",\n)\n')
+    monkeypatch.chdir(tmp_path)
+    get_current_version.cache_clear()
+    try:
+        assert get_current_version() == "1.2.3"
+        (tmp_path / "devkit" / "__init__.py").write_text('__version__ = "5.0.0"\n')
+        assert get_current_version() == "1.2.3"
+
+        assert update_version_in_files("9.9.9")
+        assert get_current_version() == "9.9.9"
+    finally:
+        get_current_version.cache_clear()
+
+def test_get_git_commit_hash(monkeypatch):
+    """Test that the commit hash is read with one cached git call"""
+    import subprocess
+    from devkit.versioning import get_git_commit_hash
+    calls = []
+
+    def fake_check_output(cmd, **kwargs):
+        calls.append(cmd)
+        return "a1b2c3d\n"
+
+    monkeypatch.setattr(subprocess, "check_output", fake_check_output)
+    get_git_commit_hash.cache_clear()
+    try:
+        assert get_git_commit_hash() == "a1b2c3d"
+        assert get_git_commit_hash() == "a1b2c3d"
+        assert len(calls) == 1
+    finally:
+        get_git_commit_hash.cache_clear()
+
+def test_get_latest_git_tag(monkeypatch):
+    """Test picking the newest semver tag and caching it until a tag is created"""
+    import subprocess
+    from devkit.versioning import create_git_tag, get_latest_git_tag
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "v1.10.0-rc1\nv1.9.0\nv1.2.0\n")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    get_latest_git_tag.cache_clear()
+    try:
+        assert get_latest_git_tag() == "1.9.0"
+        assert get_latest_git_tag() == "1.9.0"
+        assert len(calls) == 1
+        create_git_tag("1.10.0")
+        get_latest_git_tag()
+        assert len(calls) == 3
+    finally:
+        get_latest_git_tag.cache_clear()